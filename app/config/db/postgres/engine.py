@@ -1,10 +1,14 @@
 from sqlalchemy.ext.asyncio import create_async_engine
 
+from app.config.db.postgres.pool import MeteredAsyncQueuePool
 from app.config.settings import project_settings
 
 db_engine = create_async_engine(
     url=project_settings.POSTGRES_DATABASE_URL.unicode_string(),
+    poolclass=MeteredAsyncQueuePool,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=0,
+    pool_size=project_settings.POSTGRES_POOL_SIZE,
+    max_overflow=project_settings.POSTGRES_MAX_OVERFLOW,
+    pool_timeout=project_settings.POSTGRES_POOL_TIMEOUT_SECONDS,
+    pool_recycle=project_settings.POSTGRES_POOL_RECYCLE_SECONDS,
 )
@@ -0,0 +1,52 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from minio.datatypes import Object
+
+
+@dataclass
+class CachedObject:
+    stat: Object | None
+    expires_at: float
+
+
+class S3ObjectCache:
+    def __init__(self, ttl_seconds: float, max_size: int):
+        self._ttl_seconds = ttl_seconds
+        self._max_size = max_size
+        self._items: OrderedDict[tuple[str, str], CachedObject] = OrderedDict()
+
+    @property
+    def enabled(self) -> bool:
+        return self._ttl_seconds > 0 and self._max_size > 0
+
+    def get(self, bucket: str, path: str) -> CachedObject | None:
+        cached = self._items.get((bucket, path))
+        if cached is None:
+            return None
+
+        if cached.expires_at <= time.monotonic():
+            del self._items[(bucket, path)]
+            return None
+
+        self._items.move_to_end((bucket, path))
+        return cached
+
+    def put(self, bucket: str, path: str, stat: Object | None) -> CachedObject:
+        # Отсутствие объекта тоже кэшируется: повторные запросы не ходят в S3
+        cached = CachedObject(
+            stat=stat, expires_at=time.monotonic() + self._ttl_seconds
+        )
+        if not self.enabled:
+            return cached
+
+        self._items[(bucket, path)] = cached
+        self._items.move_to_end((bucket, path))
+        while len(self._items) > self._max_size:
+            self._items.popitem(last=False)
+
+        return cached
+
+    def invalidate(self, bucket: str, path: str) -> None:
+        self._items.pop((bucket, path), None)
@@ -1,35 +1,189 @@
+import asyncio
+import hashlib
 import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import timedelta
+from functools import partial
 from io import BytesIO
-from typing import Annotated, Optional
+from typing import (
+    Annotated,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Optional,
+    TypeVar,
+)
 
+import certifi
 from fastapi import Depends, UploadFile, HTTPException
 from minio import Minio
 from minio import S3Error
-from urllib3 import ProxyManager
+from minio.commonconfig import Tags
+from minio.datatypes import Object
+from urllib3 import BaseHTTPResponse, PoolManager, ProxyManager, Retry, Timeout
 
+from app.config.db.redis.session import redis_conn
+from app.config.db.s3.cache import S3ObjectCache
+from app.config.db.s3.url_cache import PresignedUrlCache
 from app.config.settings import project_settings
 from app.enums.s3 import S3BucketName, S3FolderName
 
 
+T = TypeVar("T")
+
+NOT_FOUND_CODES = ("NoSuchKey", "NoSuchObject")
+
+
+def build_minio_client() -> Minio:
+    # Один пул соединений на процесс, размером не меньше числа потоков S3
+    pool_options = {
+        "maxsize": project_settings.S3_MAX_POOL_CONNECTIONS,
+        "block": True,
+        "timeout": Timeout(
+            connect=project_settings.S3_CONNECT_TIMEOUT_SECONDS,
+            read=project_settings.S3_READ_TIMEOUT_SECONDS,
+        ),
+        "retries": Retry(
+            total=3, backoff_factor=0.2, status_forcelist=[500, 502, 503, 504]
+        ),
+        "cert_reqs": "CERT_REQUIRED",
+        "ca_certs": certifi.where(),
+    }
+
+    return Minio(
+        project_settings.S3_ENDPOINT,
+        access_key=project_settings.S3_ACCESS_KEY,
+        secret_key=project_settings.S3_SECRET_KEY,
+        region=project_settings.S3_REGION,
+        secure=project_settings.S3_REQUIRE_TLS,
+        http_client=(
+            ProxyManager(project_settings.S3_INTERNAL_URL, **pool_options)
+            if project_settings.IS_PROXY_REQUIRED
+            else PoolManager(**pool_options)
+        ),
+    )
+
+
+class S3UploadStream:
+    _ABORT = object()
+
+    def __init__(self, chunks_in_flight: int, idle_timeout_seconds: float):
+        self._queue: queue.Queue = queue.Queue(maxsize=chunks_in_flight)
+        self._idle_timeout = idle_timeout_seconds
+        self._buffer = bytearray()
+        self._eof = False
+        self._sha256 = hashlib.sha256()
+        self._upload: asyncio.Future | None = None
+        self._remove_object: Callable[[], Awaitable[None]] | None = None
+
+    def read(self, size: int = -1) -> bytes:
+        # Вызывается minio из потока S3: отдаёт куски, записанные из event loop
+        while not self._eof and (size < 0 or len(self._buffer) < size):
+            try:
+                chunk = self._queue.get(timeout=self._idle_timeout)
+            except queue.Empty:
+                # Запрос оборвался, не отменив загрузку: поток S3 не должен
+                # ждать вечно, minio отменит multipart-загрузку по ошибке
+                raise IOError("S3 upload stalled") from None
+            if chunk is self._ABORT:
+                raise IOError("S3 upload was aborted")
+            if chunk is None:
+                self._eof = True
+            else:
+                self._buffer.extend(chunk)
+
+        if size < 0:
+            size = len(self._buffer)
+        data = bytes(self._buffer[:size])
+        del self._buffer[:size]
+        return data
+
+    def attach(
+        self, upload: asyncio.Future, remove_object: Callable[[], Awaitable[None]]
+    ) -> None:
+        self._upload = upload
+        self._remove_object = remove_object
+        # Если загрузка оборвалась, очередь освобождается, чтобы write не завис
+        upload.add_done_callback(lambda _: self._drain())
+
+    def _drain(self) -> None:
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    async def _put(self, chunk: Any) -> None:
+        if self._upload.done():
+            self._upload.result()
+            raise RuntimeError("S3 upload has already finished")
+
+        await asyncio.to_thread(self._queue.put, chunk)
+
+    async def write(self, chunk: bytes) -> None:
+        self._sha256.update(chunk)
+        await self._put(chunk)
+
+    async def close(self) -> str:
+        await self._put(None)
+        await self._upload
+        return self._sha256.hexdigest()
+
+    async def abort(self) -> None:
+        # minio сам отменяет незавершённую multipart-загрузку при ошибке чтения
+        if not self._upload.done():
+            await asyncio.to_thread(self._queue.put, self._ABORT)
+        try:
+            await self._upload
+        except Exception:
+            return
+
+        # Загрузка успела завершиться: объект удаляется вместе со строкой в БД
+        await self._remove_object()
+
+    @property
+    def sha256(self) -> str:
+        return self._sha256.hexdigest()
+
+
 class S3Service:
     minio_client: Minio
     tmp_path: str
 
-    def __init__(self):
-        self.minio_client = Minio(
-            project_settings.S3_ENDPOINT,
-            access_key=project_settings.S3_ACCESS_KEY,
-            secret_key=project_settings.S3_SECRET_KEY,
-            region=project_settings.S3_REGION,
-            secure=project_settings.S3_REQUIRE_TLS,
-            http_client=(
-                ProxyManager(project_settings.S3_INTERNAL_URL)
-                if project_settings.IS_PROXY_REQUIRED
-                else None
-            ),
-        )
+    def __init__(
+        self,
+        minio_client: Minio,
+        max_workers: int,
+        object_cache: S3ObjectCache,
+        url_cache: PresignedUrlCache,
+    ):
+        self.minio_client = minio_client
+        self._object_cache = object_cache
+        self._url_cache = url_cache
         self.tmp_path: str = "./tmp"
+        # Клиент minio синхронный: запросы уходят в ограниченный пул потоков,
+        # чтобы не блокировать event loop
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="s3"
+        )
+
+    async def _run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, partial(func, *args, **kwargs)
+        )
+
+    async def _run_on_object(self, func: Callable[..., T], *args, **kwargs) -> T:
+        # Существование проверяется по ошибке самой операции, без stat_object
+        try:
+            return await self._run(func, *args, **kwargs)
+        except S3Error as e:
+            if e.code in NOT_FOUND_CODES:
+                raise HTTPException(
+                    status_code=404,
+                    detail="The file does not exist",
+                ) from e
+            raise
 
     def generate_upload_path_with_file_sid(
         self,
@@ -45,26 +199,30 @@ class S3Service:
     ) -> str:
         return f"{s3_folder_name}/{s3_object_file_name}"
 
-    def __validate_object_existance(
-        self, s3_object_path: str, s3_bucket: S3BucketName
-    ) -> None:
-        try:
-            self.minio_client.stat_object(s3_bucket, s3_object_path)
-        except S3Error as e:
-            if e.code == "NoSuchKey":
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"The file does not exist",
-                ) from e
-            raise
+    async def stat_object(self, s3_object_path: str, s3_bucket: S3BucketName) -> Object:
+        cached = self._object_cache.get(s3_bucket, s3_object_path)
+        if cached is None:
+            try:
+                stat = await self._run(
+                    self.minio_client.stat_object, s3_bucket, s3_object_path
+                )
+            except S3Error as e:
+                if e.code not in NOT_FOUND_CODES:
+                    raise
+                stat = None
+            cached = self._object_cache.put(s3_bucket, s3_object_path, stat)
+
+        if cached.stat is None:
+            raise HTTPException(status_code=404, detail="The file does not exist")
+
+        return cached.stat
 
     async def remove_digital_object(
         self, s3_object_path: str, s3_bucket: S3BucketName
     ) -> None:
-        self.__validate_object_existance(
-            s3_object_path=s3_object_path, s3_bucket=s3_bucket
-        )
-        self.minio_client.remove_object(s3_bucket, s3_object_path)
+        # Удаление в S3 идемпотентно: отсутствующий объект не считается ошибкой
+        await self._run(self.minio_client.remove_object, s3_bucket, s3_object_path)
+        await self._invalidate(s3_bucket, s3_object_path)
 
     async def upload(
         self,
@@ -83,71 +241,178 @@ class S3Service:
                 file.filename,
                 s3_folder_name,
             )
-        self.minio_client.put_object(
+        await self._run(
+            self.minio_client.put_object,
             bucket_name=s3_bucket_name,
             object_name=s3_object_path,
             data=BytesIO(source_bytes),
             content_type=file.content_type,
             length=len(source_bytes),
         )
+        await self._invalidate(s3_bucket_name, s3_object_path)
         return s3_object_path
 
+    async def _invalidate(self, s3_bucket: S3BucketName, s3_object_path: str) -> None:
+        self._object_cache.invalidate(s3_bucket, s3_object_path)
+        await self._url_cache.invalidate(s3_bucket, s3_object_path)
+
+    async def open_upload_stream(
+        self,
+        s3_object_path: str,
+        s3_bucket_name: S3BucketName,
+        content_type: str,
+    ) -> S3UploadStream:
+        stream = S3UploadStream(
+            chunks_in_flight=project_settings.S3_UPLOAD_CHUNKS_IN_FLIGHT,
+            idle_timeout_seconds=project_settings.S3_UPLOAD_IDLE_TIMEOUT_SECONDS,
+        )
+
+        def upload() -> None:
+            # Размер заранее неизвестен: minio грузит объект multipart-частями
+            self.minio_client.put_object(
+                bucket_name=s3_bucket_name,
+                object_name=s3_object_path,
+                data=stream,
+                length=-1,
+                part_size=project_settings.S3_UPLOAD_PART_SIZE,
+                content_type=content_type,
+            )
+            tags = Tags.new_object_tags()
+            tags["sha256"] = stream.sha256
+            try:
+                self.minio_client.set_object_tags(s3_bucket_name, s3_object_path, tags)
+            except Exception:
+                # Без контрольной суммы файл не считается загруженным
+                self.minio_client.remove_object(s3_bucket_name, s3_object_path)
+                raise
+
+        stream.attach(
+            asyncio.ensure_future(self._run(upload)),
+            remove_object=partial(
+                self.remove_digital_object, s3_object_path, s3_bucket_name
+            ),
+        )
+        return stream
+
     async def download(
         self, s3_object_path: str, s3_bucket: S3BucketName
     ) -> UploadFile:
-        self.__validate_object_existance(
-            s3_object_path=s3_object_path, s3_bucket=s3_bucket
-        )
         file_name = os.path.basename(s3_object_path)
 
         try:
-            response = self.minio_client.get_object(
-                bucket_name=s3_bucket,
-                object_name=s3_object_path,
+            file_bytes = await self._run_on_object(
+                self._read_object, s3_bucket, s3_object_path
             )
 
-            file_bytes = response.read()
-
             file_like = BytesIO(file_bytes)
             upload_file = UploadFile(filename=file_name, file=file_like)
 
             return upload_file
 
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(
                 status_code=500,
                 detail=f"Failed to download file '{s3_object_path}': {str(e)}",
             ) from e
 
+    async def download_stream(
+        self,
+        s3_object_path: str,
+        s3_bucket: S3BucketName,
+        chunk_size: int = project_settings.S3_DOWNLOAD_CHUNK_SIZE,
+    ) -> AsyncIterator[bytes]:
+        # Объект открывается сразу, чтобы ошибки вернулись до начала ответа
+        response = await self._run_on_object(
+            self.minio_client.get_object,
+            bucket_name=s3_bucket,
+            object_name=s3_object_path,
+        )
+        return self._iter_response(response, chunk_size)
+
+    async def _iter_response(
+        self, response: BaseHTTPResponse, chunk_size: int
+    ) -> AsyncIterator[bytes]:
+        try:
+            while chunk := await self._run(response.read, chunk_size):
+                yield chunk
+        finally:
+            # Соединение возвращается в общий пул
+            response.close()
+            response.release_conn()
+
+    def _read_object(self, s3_bucket: S3BucketName, s3_object_path: str) -> bytes:
+        response = self.minio_client.get_object(
+            bucket_name=s3_bucket,
+            object_name=s3_object_path,
+        )
+        try:
+            return response.read()
+        finally:
+            # Соединение возвращается в общий пул
+            response.close()
+            response.release_conn()
+
     async def generate_view_url(
         self,
         s3_object_path: str,
         s3_bucket: S3BucketName,
         expiration_minutes: int = 360,
+        check_exists: bool = False,
     ) -> str:
-        self.__validate_object_existance(
-            s3_object_path=s3_object_path, s3_bucket=s3_bucket
-        )
+        # Закэшированная ссылка отдаётся, пока до её истечения далеко
+        cached_url = await self._url_cache.get(s3_bucket, s3_object_path)
+        if cached_url is not None:
+            return cached_url
+
+        if check_exists:
+            await self.stat_object(s3_object_path=s3_object_path, s3_bucket=s3_bucket)
+
+        expires_at = time.time() + expiration_minutes * 60
+        # Регион задан в клиенте, поэтому подпись считается локально, без запросов
         try:
             presigned_url: str = self.minio_client.presigned_get_object(
                 bucket_name=s3_bucket,
                 object_name=s3_object_path,
                 expires=timedelta(minutes=expiration_minutes),
             )
-            return presigned_url
         except Exception as e:
             raise HTTPException(
                 status_code=500, detail=f"Failed to generate view URL: {str(e)}"
             ) from e
 
+        await self._url_cache.set(
+            s3_bucket, s3_object_path, presigned_url, expires_at=expires_at
+        )
+        return presigned_url
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
     @staticmethod
     def register():
-        return S3Service()
+        return s3_service
 
     @staticmethod
     def register_deps():
         return Annotated[S3Service, Depends(get_s3_service)]
 
 
+s3_service = S3Service(
+    minio_client=build_minio_client(),
+    max_workers=project_settings.S3_MAX_WORKERS,
+    object_cache=S3ObjectCache(
+        ttl_seconds=project_settings.S3_OBJECT_CACHE_TTL_SECONDS,
+        max_size=project_settings.S3_OBJECT_CACHE_MAX_SIZE,
+    ),
+    url_cache=PresignedUrlCache(
+        redis=redis_conn,
+        max_size=project_settings.S3_VIEW_URL_CACHE_MAX_SIZE,
+        refresh_margin_seconds=project_settings.S3_VIEW_URL_REFRESH_MARGIN_SECONDS,
+    ),
+)
+
+
 async def get_s3_service():
-    return S3Service()
+    return s3_service
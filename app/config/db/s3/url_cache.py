@@ -0,0 +1,94 @@
+import json
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.config.logger import logger
+
+
+@dataclass
+class CachedUrl:
+    url: str
+    expires_at: float
+
+
+class PresignedUrlCache:
+    def __init__(self, redis: Redis, max_size: int, refresh_margin_seconds: float):
+        self._redis = redis
+        self._max_size = max_size
+        self._refresh_margin_seconds = refresh_margin_seconds
+        self._local: OrderedDict[str, CachedUrl] = OrderedDict()
+
+    @staticmethod
+    def key(bucket: str, path: str) -> str:
+        return f"s3:view_url:{bucket}:{path}"
+
+    def _is_fresh(self, cached: CachedUrl) -> bool:
+        # Ссылка отдаётся, только если клиент успеет ей воспользоваться
+        return cached.expires_at - self._refresh_margin_seconds > time.time()
+
+    async def get(self, bucket: str, path: str) -> str | None:
+        key = self.key(bucket, path)
+
+        cached = self._local.get(key)
+        if cached is not None:
+            if self._is_fresh(cached):
+                self._local.move_to_end(key)
+                return cached.url
+            del self._local[key]
+
+        try:
+            value = await self._redis.get(key)
+        except RedisError as e:
+            logger.warning(f"Presigned URL cache is unavailable: {e}")
+            return None
+
+        if value is None:
+            return None
+
+        cached = CachedUrl(**json.loads(value))
+        if not self._is_fresh(cached):
+            return None
+
+        self._remember(key, cached)
+        return cached.url
+
+    async def set(self, bucket: str, path: str, url: str, expires_at: float) -> None:
+        key = self.key(bucket, path)
+        cached = CachedUrl(url=url, expires_at=expires_at)
+
+        ttl_seconds = int(expires_at - self._refresh_margin_seconds - time.time())
+        if ttl_seconds <= 0:
+            return
+
+        self._remember(key, cached)
+        try:
+            await self._redis.setex(
+                name=key,
+                time=ttl_seconds,
+                value=json.dumps({"url": url, "expires_at": expires_at}),
+            )
+        except RedisError as e:
+            logger.warning(f"Presigned URL cache is unavailable: {e}")
+
+    async def invalidate(self, bucket: str, path: str) -> None:
+        key = self.key(bucket, path)
+        self._local.pop(key, None)
+
+        try:
+            await self._redis.delete(key)
+        except RedisError as e:
+            logger.warning(f"Presigned URL cache is unavailable: {e}")
+
+    def _remember(self, key: str, cached: CachedUrl) -> None:
+        if self._max_size <= 0:
+            return
+
+        self._local[key] = cached
+        self._local.move_to_end(key)
+
+        while len(self._local) > self._max_size:
+            self._local.popitem(last=False)
@@ -4,6 +4,8 @@ from pydantic import Field, field_validator, PostgresDsn
 from pydantic_core.core_schema import ValidationInfo
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from app.enums.translation import InferenceBackendType
+
 
 class ProjectSettings(BaseSettings):
     model_config = SettingsConfigDict(
@@ -20,6 +22,10 @@ class ProjectSettings(BaseSettings):
     POSTGRES_USER: str = Field("test")
     POSTGRES_PASSWORD: str = Field("password")
     POSTGRES_DB: str = Field("default_db")
+    POSTGRES_POOL_SIZE: int = Field(10)
+    POSTGRES_MAX_OVERFLOW: int = Field(0)
+    POSTGRES_POOL_TIMEOUT_SECONDS: float = Field(30)
+    POSTGRES_POOL_RECYCLE_SECONDS: int = Field(1800)
 
     POSTGRES_DATABASE_URL: PostgresDsn | None = None
 
@@ -48,6 +54,19 @@ class ProjectSettings(BaseSettings):
     S3_REQUIRE_TLS: bool = Field(False)
     IS_PROXY_REQUIRED: bool = Field(False)
     S3_INTERNAL_URL: str = Field("http://minio:9000")
+    S3_MAX_WORKERS: int = Field(16)
+    S3_MAX_POOL_CONNECTIONS: int = Field(16)
+    S3_CONNECT_TIMEOUT_SECONDS: float = Field(5)
+    S3_READ_TIMEOUT_SECONDS: float = Field(300)
+    S3_UPLOAD_PART_SIZE: int = Field(5 * 1024 * 1024)
+    S3_UPLOAD_CHUNKS_IN_FLIGHT: int = Field(16)
+    S3_UPLOAD_IDLE_TIMEOUT_SECONDS: float = Field(60)
+    S3_DOWNLOAD_CHUNK_SIZE: int = Field(64 * 1024)
+    S3_OBJECT_CACHE_TTL_SECONDS: float = Field(30)
+    S3_OBJECT_CACHE_MAX_SIZE: int = Field(10000)
+    S3_VIEW_URL_CACHE_MAX_SIZE: int = Field(10000)
+    S3_VIEW_URL_REFRESH_MARGIN_SECONDS: float = Field(30 * 60)
+    UPLOAD_READ_CHUNK_SIZE: int = Field(64 * 1024)
 
     S3_ENDPOINT: str | None = None
 
@@ -70,6 +89,42 @@ class ProjectSettings(BaseSettings):
     REDIS_PORT: int = Field(6379)
     ACTIVITY_COUNT_EXPIRE_SECONDS: int = 86400 * 2
 
+    # translation
+    TRANSLATION_BACKEND: InferenceBackendType = Field(InferenceBackendType.TORCH)
+    TRANSLATION_ONNX_CACHE_DIR: str = Field("./tmp/onnx")
+    TRANSLATION_MODELS_MEMORY_BUDGET_MB: int = Field(2048)
+    TRANSLATION_MODEL_IDLE_SECONDS: int = Field(1800)
+    TRANSLATION_MODEL_IDLE_CHECK_SECONDS: int = Field(60)
+    TRANSLATION_SHARE_MEMORY: bool = Field(False)
+    TRANSLATION_SERVER_SOCKETS: list[str] = Field([])
+    TRANSLATION_SERVER_TIMEOUT_SECONDS: float = Field(300)
+    TRANSLATION_INFERENCE_WORKERS: int = Field(1)
+    TRANSLATION_INFERENCE_QUEUE_SIZE: int = Field(32)
+    TRANSLATION_TORCH_THREADS: int = Field(0)
+    TRANSLATION_MAX_LENGTH: int = Field(512)
+    TRANSLATION_LENGTH_RATIO: float = Field(2.0)
+    TRANSLATION_LENGTH_MARGIN: int = Field(16)
+    TRANSLATION_BATCH_WINDOW_MS: int = Field(10)
+    TRANSLATION_BATCH_MAX_SIZE: int = Field(16)
+    TRANSLATION_BATCH_TOKEN_BUDGET: int = Field(8192)
+    TRANSLATION_PIPELINE_WORKERS: int = Field(2)
+    TRANSLATION_PIPELINE_WINDOW_SIZE: int = Field(256)
+    TRANSLATION_CACHE_SIZE: int = Field(10000)
+    TRANSLATION_CACHE_TTL_SECONDS: int = 86400 * 30
+    TRANSLATION_CACHE_VERSION: str = Field("1")
+    TRANSLATION_PRELOAD_LANGUAGES: list[str] = Field([])
+    TRANSLATION_WARMUP_TEXT: str = Field("Открыть файл")
+    TRANSLATION_WARMUP_MAX_ATTEMPTS: int = Field(10)
+    TRANSLATION_WARMUP_MAX_BACKOFF_SECONDS: float = Field(60)
+    TRANSLATION_JOB_TTL_SECONDS: int = 86400
+    TRANSLATION_JOB_CHUNK_SIZE: int = Field(256)
+    TRANSLATION_JOB_POLL_TIMEOUT_SECONDS: int = Field(5)
+    TRANSLATION_JOB_LEASE_SECONDS: int = Field(60)
+    TRANSLATION_JOB_MAX_ATTEMPTS: int = Field(3)
+
+    # lines
+    LINES_INSERT_CHUNK_SIZE: int = Field(1000)
+
     # superuser
     SUPERUSER_NAME: str = Field("name")
     SUPERUSER_MIDDLE_NAME: str = Field("middle_name")
@@ -1,11 +1,11 @@
+from typing import AsyncIterator
+
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.config.db.postgres.session import async_session
+from app.config.db.postgres.session import postgres_session
 
 
-async def get_db() -> AsyncSession:
-    db = async_session
-    try:
+async def get_db() -> AsyncIterator[AsyncSession]:
+    # Каждый запрос получает свою сессию и своё соединение из пула
+    async with postgres_session() as db:
         yield db
-    finally:
-        await db.close()
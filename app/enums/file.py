@@ -14,3 +14,9 @@ class TranslationFileFormat(StrEnum):
 class ImageFileFormat(StrEnum):
     JPEG = ".jpg"
     PNG = ".png"
+
+
+class TSEvent(StrEnum):
+    HEADER = "header"
+    CONTEXT = "context"
+    MESSAGE = "message"
@@ -0,0 +1,26 @@
+from enum import StrEnum
+
+
+class InferenceBackendType(StrEnum):
+    TORCH = "torch"
+    TORCH_INT8 = "torch_int8"
+    ONNX = "onnx"
+
+
+class TranslationJobStatus(StrEnum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class DecodingProfile(StrEnum):
+    FAST = "fast"
+    BALANCED = "balanced"
+    QUALITY = "quality"
+
+
+class PreprocessAction(StrEnum):
+    SKIP = "skip"
+    COPY = "copy"
+    TRANSLATE = "translate"
@@ -1,14 +1,78 @@
-from fastapi import FastAPI
+import asyncio
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, HTTPException
 from fastapi_pagination import add_pagination
 from starlette.middleware.cors import CORSMiddleware
 
+from app.config.db.s3.service import s3_service
+from app.config.logger import logger
 from app.config.settings import project_settings
 from app.router import api_router
+from app.services.translation.inference_executor import inference_executor
+from app.services.translation.model_registry import unload_idle_models
+from app.services.translation.translation_service import translation_service
+
+
+async def warm_up_translation() -> None:
+    delay = 1
+    failures = 0
+    while True:
+        try:
+            await translation_service.warm_up(
+                languages=project_settings.TRANSLATION_PRELOAD_LANGUAGES
+            )
+            return
+        except HTTPException as e:
+            # Сервер инференса может подняться позже API-воркеров
+            logger.warning(f"Translation warm-up is postponed: {e.detail}")
+        except Exception as e:
+            # Сбой скачивания или чтения весов может быть временным
+            failures += 1
+            logger.error(
+                f"Translation warm-up failed ({failures}/"
+                f"{project_settings.TRANSLATION_WARMUP_MAX_ATTEMPTS}): {e}"
+            )
+            if failures >= project_settings.TRANSLATION_WARMUP_MAX_ATTEMPTS:
+                # Liveness перестаёт отвечать, и оркестратор перезапускает воркер
+                translation_service.warm_up_failed = True
+                return
+
+        await asyncio.sleep(delay)
+        delay = min(delay * 2, project_settings.TRANSLATION_WARMUP_MAX_BACKOFF_SECONDS)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Неизвестный код языка - ошибка конфигурации, воркер не должен стартовать
+    translation_service.validate_languages(
+        project_settings.TRANSLATION_PRELOAD_LANGUAGES
+    )
+
+    # Прогрев идёт в фоне: liveness отвечает сразу, readiness - после прогрева
+    warm_up_task = asyncio.create_task(warm_up_translation())
+    unload_task = (
+        asyncio.create_task(unload_idle_models())
+        if project_settings.TRANSLATION_MODEL_IDLE_SECONDS > 0
+        else None
+    )
+    yield
+    warm_up_task.cancel()
+    if unload_task:
+        unload_task.cancel()
+    inference_executor.shutdown()
+    s3_service.shutdown()
+
+
+# При gunicorn --preload модели загружаются в мастере и разделяются воркерами
+if project_settings.TRANSLATION_SHARE_MEMORY:
+    translation_service.load_models(project_settings.TRANSLATION_PRELOAD_LANGUAGES)
 
 app = FastAPI(
     debug=True,
     title="Translator Space",
     version="v1",
+    lifespan=lifespan,
 )
 
 origins = ["*"]
@@ -1,92 +1,321 @@
 from io import BytesIO
+from typing import (
+    IO,
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Iterable,
+    Iterator,
+)
 
-from bs4 import BeautifulSoup
-from fastapi import UploadFile
+from fastapi import HTTPException, UploadFile
+from lxml import etree
+
+from app.enums.file import TSEvent
+
+
+TS_TAGS = ("TS", "context", "name", "message")
 
 
 class TSFormatParser:
 
     async def from_ts_to_json(self, file_content: bytes) -> dict:
         final_json = {}
-
-        soup = BeautifulSoup(file_content, "xml")
-        ts = soup.find("TS")
-        final_json["language"] = ts["language"]
-        final_json["sourcelanguage"] = ts["sourcelanguage"]
         final_dict = []
-        contexts = soup.find_all("context")
-
-        for context in contexts:
-            json = {}
-            name = context.find("name").get_text(strip=True)
-
-            messages = context.find_all("message")
-            dict = []
-            for message in messages:
-                source = message.find("source").get_text(strip=True)
-                translation = message.find("translation").get_text(strip=True)
-                location = message.find("location")
-                dict.append(
-                    {
-                        "source": source,
-                        "translation": translation,
-                        "filename": location["filename"],
-                        "line": location["line"],
-                    }
-                )
-            json[name] = dict
-            final_dict.append(json)
+
+        for event, value in self.iter_ts(BytesIO(file_content)):
+            if event == TSEvent.HEADER:
+                final_json.update(value)
+            elif event == TSEvent.CONTEXT:
+                messages = []
+                final_dict.append({value: messages})
+            else:
+                messages.append(value)
 
         final_json["contexts"] = final_dict
 
         return final_json
 
+    def iter_ts(self, source: IO[bytes]) -> Iterator[tuple[TSEvent, Any]]:
+        # Элементы разбираются по мере чтения и сразу очищаются,
+        # поэтому память не растёт с размером файла
+        events = etree.iterparse(
+            source,
+            events=("start", "end"),
+            tag=TS_TAGS,
+            huge_tree=True,
+            resolve_entities=False,
+            no_network=True,
+        )
+        yield from self.handle_events(events)
+
+    def read_header(self, events: Iterator[tuple[TSEvent, Any]]) -> dict:
+        try:
+            event, value = next(events, (None, None))
+        except etree.XMLSyntaxError:
+            event, value = None, None
+
+        if event != TSEvent.HEADER:
+            raise HTTPException(status_code=400, detail="Неверный формат файла")
+
+        return value
+
+    def handle_events(
+        self, events: Iterable[tuple[str, etree._Element]]
+    ) -> Iterator[tuple[TSEvent, Any]]:
+        for action, element in events:
+            if action == "start":
+                if element.tag == "TS":
+                    yield TSEvent.HEADER, {
+                        "language": element.get("language"),
+                        "sourcelanguage": element.get("sourcelanguage"),
+                    }
+                continue
+
+            parent = element.getparent()
+            if element.tag == "name" and parent.tag == "context":
+                yield TSEvent.CONTEXT, self._get_text(element)
+
+            elif element.tag == "message":
+                location = element.find("location")
+                if location is None:
+                    location = {}
+
+                yield TSEvent.MESSAGE, {
+                    "source": self._get_text(element.find("source")),
+                    "translation": self._get_text(element.find("translation")),
+                    "filename": location.get("filename"),
+                    "line": location.get("line"),
+                }
+                self._release(element)
+
+            elif element.tag == "context":
+                self._release(element)
+
+    def _get_text(self, element: etree._Element | None) -> str:
+        # Аналог get_text(strip=True) из BeautifulSoup
+        if element is None:
+            return ""
+        return "".join(
+            text.strip() for text in element.itertext(tag=etree.Element) if text
+        )
+
+    def _release(self, element: etree._Element) -> None:
+        element.clear(keep_tail=True)
+        parent = element.getparent()
+        if parent is not None:
+            while element.getprevious() is not None:
+                del parent[0]
+
     def normalize_text(self, text: str) -> str:
         return "".join(text.split())
 
-    async def from_list_to_ts(self, lines: list, file_content: bytes, file_name: str):
-        soup = BeautifulSoup(file_content, "xml")
-        contexts = soup.find_all("context")
-
-        line_dict = {
+    def stream_translated_ts(
+        self, lines: list, source: AsyncIterable[bytes]
+    ) -> AsyncIterator[bytes]:
+        # Словарь собирается сразу: к моменту отдачи ответа сессия БД уже закрыта
+        translations = {
             (line.group, self.normalize_text(line.meaning)): line.translation
             for line in lines
         }
+        return TSExportWriter(parser=self, translations=translations).iter_chunks(
+            source
+        )
+
+    def apply_translation(
+        self, context_name: str, message: etree._Element, translations: dict
+    ) -> None:
+        source = message.find("source")
+        translation = message.find("translation")
+
+        if source is None or translation is None:
+            return
+
+        source_text = "".join(source.itertext(tag=etree.Element))
+        translation_text = "".join(translation.itertext(tag=etree.Element))
+
+        if not (source_text and translation_text):
+            return
+
+        new_translation = translations.get(
+            (context_name, self.normalize_text(source_text))
+        )
+        if new_translation is None or self.normalize_text(
+            translation_text
+        ) == self.normalize_text(new_translation):
+            return
+
+        self._replace_text(source, source_text)
+        self._replace_text(translation, new_translation)
+
+    def _replace_text(self, element: etree._Element, text: str) -> None:
+        for child in list(element):
+            element.remove(child)
+        element.text = text
+
+
+class TSExportWriter:
+    def __init__(self, parser: TSFormatParser, translations: dict):
+        self._parser = parser
+        self._translations = translations
+        self._pull_parser = etree.XMLPullParser(
+            events=("start", "end", "comment", "pi"),
+            huge_tree=True,
+            resolve_entities=False,
+            no_network=True,
+        )
+        self._output = BytesIO()
+        # Открытые TS и context: [элемент, контекст записи, последний потомок]
+        self._open: list[list] = []
+        self._context_name = ""
+        self._root_closed = False
+
+    async def iter_chunks(self, source: AsyncIterable[bytes]) -> AsyncIterator[bytes]:
+        # Файл переписывается по одному message, не собираясь целиком в памяти
+        with etree.xmlfile(self._output, encoding="utf-8") as xf:
+            xf.write_declaration()
+            xf.write_doctype("<!DOCTYPE TS>")
+
+            async for chunk in source:
+                self._pull_parser.feed(chunk)
+                self._write_events(xf)
+                if data := self._take(xf):
+                    yield data
+
+            self._pull_parser.close()
+            self._write_events(xf)
+
+        yield self._output.getvalue()
+
+    def _take(self, xf) -> bytes:
+        xf.flush()
+        data = self._output.getvalue()
+        self._output.seek(0)
+        self._output.truncate()
+        return data
+
+    def _write_events(self, xf) -> None:
+        for action, element in self._pull_parser.read_events():
+            parent = element.getparent()
+            is_child = bool(self._open) and parent is self._open[-1][0]
+
+            if action in ("comment", "pi"):
+                # Комментарии внутри message пишутся вместе с ним
+                if is_child:
+                    self._write_gap(xf)
+                    xf.write(element, with_tail=False)
+                    self._close_child(element)
+                elif parent is None:
+                    # Узлы вне корня xmlfile не пишет, они добавляются напрямую
+                    xf.flush()
+                    node = etree.tostring(element, encoding="utf-8", with_tail=False)
+                    self._output.write(
+                        b"\n" + node if self._root_closed else node + b"\n"
+                    )
+                continue
+
+            if action == "start":
+                if (element.tag == "TS" and parent is None) or (
+                    element.tag == "context" and is_child and parent.tag == "TS"
+                ):
+                    self._write_gap(xf)
+                    writer = xf.element(element.tag, dict(element.attrib))
+                    writer.__enter__()
+                    self._open.append([element, writer, None])
+                continue
+
+            if self._open and element is self._open[-1][0]:
+                self._write_gap(xf)
+                self._open.pop()[1].__exit__(None, None, None)
+                self._root_closed = not self._open
+                self._close_child(element)
+
+            elif is_child:
+                if element.tag == "name" and parent.tag == "context":
+                    self._context_name = self._parser._get_text(element)
+                elif element.tag == "message":
+                    self._parser.apply_translation(
+                        self._context_name, element, self._translations
+                    )
+
+                self._write_gap(xf)
+                xf.write(element, with_tail=False)
+                self._close_child(element)
+
+    def _write_gap(self, xf) -> None:
+        # Пробелы между элементами известны только когда начался следующий,
+        # поэтому хвост предыдущего потомка пишется с опозданием
+        if not self._open:
+            return
+
+        parent, _, last_child = self._open[-1]
+        gap = parent.text if last_child is None else last_child.tail
+        if gap:
+            xf.write(gap)
 
-        for context in contexts:
-            name = context.find("name").get_text(strip=True)
-            messages = context.find_all("message")
+    def _close_child(self, element: etree._Element) -> None:
+        if self._open:
+            self._open[-1][2] = element
+        self._parser._release(element)
 
-            for message in messages:
-                source = message.find("source")
-                translation = message.find("translation")
 
-                if not (source and translation):
-                    continue
+class TSUploadReader:
+    def __init__(self, file: UploadFile, parser: TSFormatParser, chunk_size: int):
+        self._file = file
+        self._parser = parser
+        self._chunk_size = chunk_size
+        self._pull_parser = etree.XMLPullParser(
+            events=("start", "end"),
+            tag=TS_TAGS,
+            huge_tree=True,
+            resolve_entities=False,
+            no_network=True,
+        )
+        self._head_chunks: list[bytes] = []
+        self._head_events: list[tuple[TSEvent, Any]] = []
 
-                source_text = source.get_text(strip=False)
-                translation_text = translation.get_text(strip=False)
+    def _feed(self, chunk: bytes) -> list[tuple[TSEvent, Any]]:
+        self._pull_parser.feed(chunk)
+        return list(self._parser.handle_events(self._pull_parser.read_events()))
 
-                if not (source_text and translation_text):
-                    continue
+    async def read_header(self) -> dict:
+        # Читается только начало файла, пока не встретится корневой элемент TS
+        try:
+            while not self._head_events:
+                chunk = await self._file.read(self._chunk_size)
+                if not chunk:
+                    break
+                self._head_chunks.append(chunk)
+                self._head_events.extend(self._feed(chunk))
+        except etree.XMLSyntaxError:
+            self._head_events = []
 
-                key = (name, self.normalize_text(source_text))
-                if key in line_dict:
-                    new_translation = line_dict[key]
+        events = iter(self._head_events)
+        header = self._parser.read_header(events)
+        self._head_events = list(events)
+        return header
 
-                    if self.normalize_text(translation_text) != self.normalize_text(
-                        new_translation
-                    ):
-                        source.clear()
-                        source.append(source_text)
+    async def iter_events(
+        self, sink: Callable[[bytes], Awaitable[None]]
+    ) -> AsyncIterator[tuple[TSEvent, Any]]:
+        # Одни и те же куски файла уходят и в sink (S3), и в парсер, без второй копии
+        for chunk in self._head_chunks:
+            await sink(chunk)
+        self._head_chunks = []
 
-                        translation.clear()
-                        translation.append(new_translation)
+        for event in self._head_events:
+            yield event
 
-        modified_xml = soup.prettify().encode("utf-8")
-        file_like = BytesIO(modified_xml)
+        while chunk := await self._file.read(self._chunk_size):
+            await sink(chunk)
+            for event in self._feed(chunk):
+                yield event
 
-        return UploadFile(file=file_like, filename=file_name)
+        self._pull_parser.close()
+        for event in self._parser.handle_events(self._pull_parser.read_events()):
+            yield event
 
 
 ts_format_parser = TSFormatParser()
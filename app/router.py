@@ -1,6 +1,6 @@
 from fastapi import APIRouter
 
-from app.routers import admin, project, file, line, auth, user
+from app.routers import admin, project, file, line, auth, user, metrics, health
 
 api_router = APIRouter()
 
@@ -15,3 +15,7 @@ api_router.include_router(project.router, tags=["Project"], prefix="/project")
 api_router.include_router(file.router, tags=["File"], prefix="/file")
 
 api_router.include_router(line.router, tags=["Line"], prefix="/line")
+
+api_router.include_router(metrics.router, tags=["Metrics"], prefix="/metrics")
+
+api_router.include_router(health.router, tags=["Health"], prefix="/health")
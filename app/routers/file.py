@@ -3,15 +3,16 @@ from uuid import UUID
 
 from fastapi import APIRouter, Depends, UploadFile, HTTPException, File
 from fastapi.responses import StreamingResponse
+from lxml.etree import XMLSyntaxError
 
 from app.config.auth.current_user import get_current_active_user
 from app.config.db.s3.service import S3Service
 from app.config.logger import logger
+from app.config.settings import project_settings
 from app.enums.file import ContentType
 from app.enums.s3 import S3BucketName
-from app.parsing.ts.ts import ts_format_parser
+from app.parsing.ts.ts import TSUploadReader, ts_format_parser
 from app.schemas.file import FileCreate, FileLines, File as FileDB, FileUpdate
-from app.schemas.line import LineCreate
 from app.services.file_service import FileService
 from app.services.line_service import LineService
 from app.services.project_service import ProjectService
@@ -92,49 +93,53 @@ async def upload_translation_file(
         logger.warning("Project not found")
         raise HTTPException(status_code=404, detail="Проект не найден!")
 
-    source_bytes = await file.read()
-
-    logger.info("Parse a ts file to json")
-    ts_json = await ts_format_parser.from_ts_to_json(source_bytes)
+    logger.info("Parse a ts file header")
+    ts_reader = TSUploadReader(
+        file=file,
+        parser=ts_format_parser,
+        chunk_size=project_settings.UPLOAD_READ_CHUNK_SIZE,
+    )
+    ts_header = await ts_reader.read_header()
 
     logger.info("Start create file in db")
     file_in = FileCreate(
         project_sid=project_sid,
         name=file.filename,
-        source_language=ts_json["sourcelanguage"],
-        translate_language=ts_json["language"],
+        source_language=ts_header["sourcelanguage"],
+        translate_language=ts_header["language"],
     )
     file_db = await file_service.create_file(file_in=file_in)
     file_sid = file_db.sid
     logger.info("Finish create file in db")
 
-    await s3_service.upload(
-        file=file,
-        source_bytes=source_bytes,
-        file_sid=str(file_sid),
+    # Файл читается один раз: куски одновременно уходят в S3 и в парсер строк
+    upload_stream = await s3_service.open_upload_stream(
+        s3_object_path=s3_service.generate_upload_path_with_file_sid(
+            s3_object_file_name=file.filename, file_sid=str(file_sid)
+        ),
         s3_bucket_name=S3BucketName.TRANSLATION,
+        content_type=file.content_type,
     )
 
-    await file.close()
-
-    logger.info("Add file with lines to db")
-    all_lines_db = []
-    for lines in ts_json["contexts"]:
-        for group, lines in lines.items():
-            for line in lines:
-                line_in = LineCreate(
-                    file_sid=file_db.sid,
-                    meaning=line["source"],
-                    translation=line["translation"],
-                    translated=True,
-                    group=group,
-                    filename=line["filename"],
-                    line=line["line"],
-                )
-                all_lines_db.append(line_in)
-
-    await line_service.create_from_list(list_lines=all_lines_db)
-    logger.info("Created file in db")
+    logger.info("Upload file to s3 and add lines to db")
+    try:
+        lines_count = await line_service.create_from_ts_events(
+            file_sid=file_sid, events=ts_reader.iter_events(sink=upload_stream.write)
+        )
+        checksum = await upload_stream.close()
+    except XMLSyntaxError:
+        logger.warning("Invalid ts file")
+        await upload_stream.abort()
+        await file_service.delete_file(file_sid=file_sid)
+        raise HTTPException(status_code=400, detail="Неверный формат файла")
+    except BaseException:
+        # В том числе отмена запроса: иначе поток S3 ждал бы данных до таймаута
+        await upload_stream.abort()
+        await file_service.delete_file(file_sid=file_sid)
+        raise
+    finally:
+        await file.close()
+    logger.info(f"Created file in db with {lines_count} lines, sha256 {checksum}")
 
     return await file_service.get_one_file(
         file_sid=file_sid, custom_options=FileCustomOptions.with_lines()
@@ -156,24 +161,15 @@ async def create_translation_file(
         logger.warning("File not found")
         raise HTTPException(status_code=404, detail="Файл не найден в базе!")
 
-    s3_file = await s3_service.download(
+    source = await s3_service.download_stream(
         f"{file.sid}/{file.name}", S3BucketName.TRANSLATION
     )
 
-    source_bytes = await s3_file.read()
-    logger.info("Parse list lines to file")
-    modified_file = await ts_format_parser.from_list_to_ts(
-        lines=file.lines, file_content=source_bytes, file_name=file.name
-    )
-
-    await s3_file.close()
     logger.info("Return created file")
     return StreamingResponse(
-        modified_file.file,
+        ts_format_parser.stream_translated_ts(lines=file.lines, source=source),
         media_type=ContentType.TS,
-        headers={
-            "Content-Disposition": f"attachment; filename={modified_file.filename}"
-        },
+        headers={"Content-Disposition": f"attachment; filename={file.name}"},
     )
 
 
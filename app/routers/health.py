@@ -0,0 +1,38 @@
+from fastapi import APIRouter, HTTPException
+from starlette import status
+
+from app.config.consts.msg import Msg
+from app.config.settings import project_settings
+from app.schemas.translation import TranslationReadiness
+from app.services.translation.model_registry import model_registry
+from app.services.translation.translation_service import translation_service
+
+router = APIRouter()
+
+
+@router.get(path="/live/")
+async def live() -> Msg:
+    if translation_service.warm_up_failed:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Translation warm-up failed",
+        )
+
+    return Msg(msg="ok")
+
+
+@router.get(path="/ready/")
+async def ready() -> TranslationReadiness:
+    readiness = TranslationReadiness(
+        ready=translation_service.ready,
+        preload_languages=project_settings.TRANSLATION_PRELOAD_LANGUAGES,
+        loaded_models=model_registry.stats().models,
+    )
+
+    if not readiness.ready:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=readiness.model_dump(),
+        )
+
+    return readiness
@@ -1,18 +1,23 @@
-from typing import List
+from typing import AsyncIterator, List
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from starlette import status
 
 from app.config.auth.current_user import get_current_active_user
 from app.config.logger import logger
+from app.enums.translation import DecodingProfile
 from app.schemas.line import (
     Line,
     LineUpdate,
     ChangeLine,
     TranslationMLLine,
 )
+from app.schemas.translation import TranslationJob, TranslationStreamTrailer
 from app.services.file_service import FileService
 from app.services.line_service import LineService
+from app.services.translation.jobs import translation_job_queue
 from app.services.translation.translation_service import TranslationService
 from app.utils.custom_options.line_options import LineCustomOptions
 
@@ -55,6 +60,7 @@ async def generate_translation_for_line(
     sid: UUID,
     line_service: LineService.register_deps(),
     translation_service: TranslationService.register_deps(),
+    profile: DecodingProfile = DecodingProfile.FAST,
 ) -> ChangeLine:
     line = await line_service.get_one_line(
         line_sid=sid, custom_options=LineCustomOptions.with_file()
@@ -65,7 +71,7 @@ async def generate_translation_for_line(
         raise HTTPException(status_code=404, detail="Строка не найдена!")
 
     translation_ml = await translation_service.translate(
-        texts=line.meaning, language=line.file.translate_language
+        texts=line.meaning, language=line.file.translate_language, profile=profile
     )
 
     return ChangeLine(meaning=line.meaning, translation=translation_ml[0])
@@ -77,9 +83,11 @@ async def generate_translation_for_line(
 )
 async def generate_translation_for_many_lines(
     sid: UUID,
+    response: Response,
     file_service: FileService.register_deps(),
     line_service: LineService.register_deps(),
     translation_service: TranslationService.register_deps(),
+    profile: DecodingProfile = DecodingProfile.QUALITY,
 ) -> list[TranslationMLLine]:
     file = await file_service.get_one_file(file_sid=sid)
 
@@ -95,9 +103,17 @@ async def generate_translation_for_many_lines(
         all_translation_meanings.append(line.meaning)
         all_translation_sids.append(line.sid)
 
-    translation_ml = await translation_service.translate(
-        texts=all_translation_meanings, language=file.translate_language
+    translation_ml, deduplicated = await translation_service.translate_deduplicated(
+        texts=all_translation_meanings,
+        language=file.translate_language,
+        profile=profile,
     )
+    logger.info(f"Skipped {deduplicated} duplicate lines before translation")
+
+    if len(translation_ml) != len(all_translation_meanings):
+        raise HTTPException(status_code=500, detail="Не удалось перевести файл!")
+
+    response.headers["X-Translation-Deduplicated"] = str(deduplicated)
 
     all_translations = []
 
@@ -112,6 +128,119 @@ async def generate_translation_for_many_lines(
     return all_translations
 
 
+@router.post(
+    path="/generate-translation/by-file/{sid}/stream",
+    dependencies=[Depends(get_current_active_user)],
+)
+async def stream_translation_for_many_lines(
+    sid: UUID,
+    file_service: FileService.register_deps(),
+    line_service: LineService.register_deps(),
+    translation_service: TranslationService.register_deps(),
+    profile: DecodingProfile = DecodingProfile.QUALITY,
+) -> StreamingResponse:
+    file = await file_service.get_one_file(file_sid=sid)
+
+    if not file:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    lines = await line_service.get_all_lines_by_file_sid(file_sid=sid)
+    meanings = [line.meaning for line in lines]
+    sids = [line.sid for line in lines]
+    chunks = translation_service.translate_stream(
+        texts=meanings, language=file.translate_language, profile=profile
+    )
+
+    async def translated_lines() -> AsyncIterator[str]:
+        logger.info(f"Start streaming translation of {len(meanings)} lines")
+        translated = 0
+        error = None
+        try:
+            async for chunk in chunks:
+                # Каждая строка NDJSON - готовый TranslationMLLine
+                yield "".join(
+                    TranslationMLLine(
+                        sid=sids[index],
+                        meaning=meanings[index],
+                        translation=translation,
+                    ).model_dump_json()
+                    + "\n"
+                    for index, translation in chunk
+                )
+                translated += len(chunk)
+        except HTTPException as e:
+            logger.error(f"Streaming translation failed: {e.detail}")
+            error = str(e.detail)
+        except Exception as e:
+            logger.error(f"Streaming translation failed: {e}")
+            error = "Не удалось перевести файл!"
+        else:
+            logger.info("Finish streaming translation")
+
+        # Статус ответа уже отправлен: по последней записи клиент отличает
+        # полный перевод от оборванного
+        yield (
+            TranslationStreamTrailer(
+                done=error is None,
+                total=len(meanings),
+                translated=translated,
+                error=error,
+            ).model_dump_json()
+            + "\n"
+        )
+
+    return StreamingResponse(translated_lines(), media_type="application/x-ndjson")
+
+
+@router.post(
+    path="/generate-translation/by-file/{sid}/job",
+    dependencies=[Depends(get_current_active_user)],
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def enqueue_translation_for_many_lines(
+    sid: UUID,
+    file_service: FileService.register_deps(),
+    profile: DecodingProfile = DecodingProfile.QUALITY,
+) -> TranslationJob:
+    file = await file_service.get_one_file(file_sid=sid)
+
+    if not file:
+        raise HTTPException(status_code=404, detail="File not found")
+
+    logger.info("Enqueue translation job for file")
+    return await translation_job_queue.enqueue(
+        file_sid=file.sid, language=file.translate_language, profile=profile
+    )
+
+
+@router.get(
+    path="/generate-translation/job/{job_id}",
+    dependencies=[Depends(get_current_active_user)],
+)
+async def get_translation_job(job_id: str) -> TranslationJob:
+    job = await translation_job_queue.get(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Задача не найдена!")
+
+    return job
+
+
+@router.get(
+    path="/generate-translation/job/{job_id}/result",
+    dependencies=[Depends(get_current_active_user)],
+)
+async def get_translation_job_result(
+    job_id: str, offset: int = 0, limit: int | None = None
+) -> list[TranslationMLLine]:
+    job = await translation_job_queue.get(job_id)
+
+    if not job:
+        raise HTTPException(status_code=404, detail="Задача не найдена!")
+
+    return await translation_job_queue.get_results(job_id, offset=offset, limit=limit)
+
+
 @router.put(path="/update/{sid}", dependencies=[Depends(get_current_active_user)])
 async def update_one_line(
     sid: UUID,
@@ -0,0 +1,28 @@
+from fastapi import APIRouter
+
+from app.config.db.postgres.engine import db_engine
+from app.schemas.database import DatabasePoolStats
+from app.schemas.translation import TranslationMetrics
+from app.services.translation.inference_executor import inference_executor
+from app.services.translation.model_registry import model_registry
+from app.services.translation.translation_memory import translation_memory
+from app.services.translation.translation_service import translation_service
+
+router = APIRouter()
+
+
+@router.get(path="/translation/")
+async def get_translation_metrics() -> TranslationMetrics:
+    return TranslationMetrics(
+        registry=model_registry.stats(),
+        executor=inference_executor.stats(),
+        batching=translation_service.batching_stats(),
+        memory=translation_memory.stats(),
+        preprocessing=translation_service.preprocessing_stats(),
+        deduplicated=translation_service.deduplicated,
+    )
+
+
+@router.get(path="/db/")
+async def get_db_metrics() -> DatabasePoolStats:
+    return db_engine.pool.stats()
@@ -189,7 +189,9 @@ async def get_image(
 
     logger.info("Get image from s3")
     img_url = await s3_service.generate_view_url(
-        s3_object_path=s3_object_path, s3_bucket=S3BucketName.IMAGES
+        s3_object_path=s3_object_path,
+        s3_bucket=S3BucketName.IMAGES,
+        check_exists=True,
     )
     return ViewUrlSchemaOut(url=img_url)
 
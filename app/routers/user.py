@@ -171,11 +171,13 @@ async def get_image(
     s3_service: S3Service.register_deps(),
 ) -> ViewUrlSchemaOut:
     s3_object_path = s3_service.generate_upload_path_with_folder_name(
-        s3_object_file_name=current_user.img, s3_folder_name=S3FolderName.PROJECT
+        s3_object_file_name=current_user.img, s3_folder_name=S3FolderName.USER
     )
     logger.info("Get image from s3")
     img_url = await s3_service.generate_view_url(
-        s3_object_path=s3_object_path, s3_bucket=S3BucketName.IMAGES
+        s3_object_path=s3_object_path,
+        s3_bucket=S3BucketName.IMAGES,
+        check_exists=True,
     )
     return ViewUrlSchemaOut(url=img_url)
 
@@ -187,7 +189,7 @@ async def delete_image(
     s3_service: S3Service.register_deps(),
 ) -> MessageResponseSchemaOut:
     s3_object_path = s3_service.generate_upload_path_with_folder_name(
-        s3_object_file_name=current_user.img, s3_folder_name=S3FolderName.PROJECT
+        s3_object_file_name=current_user.img, s3_folder_name=S3FolderName.USER
     )
     logger.info("Delete image from s3")
     await s3_service.remove_digital_object(
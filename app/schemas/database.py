@@ -0,0 +1,12 @@
+from app.schemas.core_schema import CoreSchema
+
+
+class DatabasePoolStats(CoreSchema):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
@@ -0,0 +1,83 @@
+from uuid import UUID
+
+from app.enums.translation import DecodingProfile, TranslationJobStatus
+from app.schemas.core_schema import CoreSchema
+
+
+class ModelResidency(CoreSchema):
+    name: str
+    size_bytes: int
+    idle_seconds: float
+    pinned: bool
+
+
+class ModelRegistryStats(CoreSchema):
+    backend: str
+    loads: int
+    hits: int
+    evictions: int
+    idle_evictions: int
+    memory_budget_bytes: int
+    resident_bytes: int
+    models: list[str]
+    residency: list[ModelResidency]
+
+
+class InferenceExecutorStats(CoreSchema):
+    workers: int
+    capacity: int
+    in_flight: int
+    completed: int
+    rejected: int
+
+
+class MicroBatcherStats(CoreSchema):
+    batches: int
+    items: int
+    pending: int
+
+
+class TranslationMemoryStats(CoreSchema):
+    local_hits: int
+    redis_hits: int
+    misses: int
+    local_size: int
+
+
+class PreprocessingStats(CoreSchema):
+    skipped: int
+    copied: int
+    masked: int
+
+
+class TranslationMetrics(CoreSchema):
+    registry: ModelRegistryStats
+    executor: InferenceExecutorStats
+    batching: MicroBatcherStats
+    memory: TranslationMemoryStats
+    preprocessing: PreprocessingStats
+    deduplicated: int
+
+
+class TranslationJob(CoreSchema):
+    job_id: str
+    file_sid: UUID
+    language: str
+    profile: DecodingProfile
+    status: TranslationJobStatus
+    done: int
+    total: int
+    error: str | None = None
+
+
+class TranslationStreamTrailer(CoreSchema):
+    done: bool
+    total: int
+    translated: int
+    error: str | None = None
+
+
+class TranslationReadiness(CoreSchema):
+    ready: bool
+    preload_languages: list[str]
+    loaded_models: list[str]
@@ -1,14 +1,19 @@
-from typing import Annotated, Sequence, List
+from typing import Annotated, Any, AsyncIterable, AsyncIterator, List, Sequence
 from uuid import UUID
 
 from fastapi import Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.sql.base import ExecutableOption
 
+from app.config.settings import project_settings
 from app.deps.db import get_db
+from app.enums.file import TSEvent
 from app.models import LineModel
 from app.schemas.line import LineCreate, LineUpdate
-from app.services.repositories.line_repository import LineRepository
+from app.services.repositories.line_repository import (
+    LINE_ROW_COLUMNS,
+    LineRepository,
+)
 
 
 class LineService:
@@ -18,7 +23,42 @@ class LineService:
     async def create_from_list(
         self, list_lines: list[LineCreate]
     ) -> Sequence[LineCreate]:
-        return await self._line_repository.create_all(c_objects=list_lines)
+        async def rows() -> AsyncIterator[tuple]:
+            for line in list_lines:
+                yield tuple(getattr(line, column) for column in LINE_ROW_COLUMNS)
+
+        await self._line_repository.create_from_rows(
+            rows=rows(), chunk_size=project_settings.LINES_INSERT_CHUNK_SIZE
+        )
+        return list_lines
+
+    async def create_from_ts_events(
+        self, file_sid: UUID, events: AsyncIterable[tuple[TSEvent, Any]]
+    ) -> int:
+        return await self._line_repository.create_from_rows(
+            rows=self._iter_rows(file_sid=file_sid, events=events),
+            chunk_size=project_settings.LINES_INSERT_CHUNK_SIZE,
+        )
+
+    @staticmethod
+    async def _iter_rows(
+        file_sid: UUID, events: AsyncIterable[tuple[TSEvent, Any]]
+    ) -> AsyncIterator[tuple]:
+        group = None
+
+        async for event, value in events:
+            if event == TSEvent.CONTEXT:
+                group = value
+            elif event == TSEvent.MESSAGE:
+                yield (
+                    UUID(str(file_sid)),
+                    group,
+                    value["filename"],
+                    int(value["line"]) if value["line"] else None,
+                    value["source"],
+                    value["translation"],
+                    True,
+                )
 
     async def create_line(self, line_in: LineCreate) -> LineModel:
         return await self._line_repository.create(c_obj=line_in)
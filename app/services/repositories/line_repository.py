@@ -1,5 +1,6 @@
-from typing import Sequence
-from uuid import UUID
+from datetime import datetime
+from typing import AsyncIterable, Sequence
+from uuid import UUID, uuid4
 
 from sqlalchemy import delete, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,10 +11,65 @@ from app.schemas.line import LineCreate, LineUpdate
 from app.services.repositories.crud import CrudRepository
 
 
+LINE_ROW_COLUMNS = (
+    "file_sid",
+    "group",
+    "filename",
+    "line",
+    "meaning",
+    "translation",
+    "translated",
+)
+
+
 class LineRepository(CrudRepository[LineModel, LineCreate, LineUpdate]):
     def __init__(self, db: AsyncSession):
         super().__init__(LineModel, db)
 
+    async def create_from_rows(
+        self, rows: AsyncIterable[tuple], chunk_size: int
+    ) -> int:
+        # Строки пишутся пачками через COPY по мере поступления,
+        # без ORM-объектов и refresh на каждую строку
+        connection = await self.db.connection()
+        raw_connection = await connection.get_raw_connection()
+        driver_connection = raw_connection.driver_connection
+        table = self.model.__table__
+
+        async def copy(chunk: list[tuple]) -> None:
+            now = datetime.now().astimezone().replace(microsecond=0)
+            await driver_connection.copy_records_to_table(
+                table.name,
+                schema_name=table.schema,
+                columns=[*LINE_ROW_COLUMNS, "sid", "created", "updated"],
+                records=[(*row, uuid4(), now, now) for row in chunk],
+            )
+
+        chunk: list[tuple] = []
+        count = 0
+
+        try:
+            # Транзакция asyncpg (или savepoint, если сессия её уже начала)
+            # делает загрузку всех пачек атомарной
+            async with driver_connection.transaction():
+                async for row in rows:
+                    chunk.append(row)
+                    if len(chunk) >= chunk_size:
+                        await copy(chunk)
+                        count += len(chunk)
+                        chunk = []
+
+                if chunk:
+                    await copy(chunk)
+                    count += len(chunk)
+
+            await self.db.commit()
+        except BaseException:
+            await self.db.rollback()
+            raise
+
+        return count
+
     async def delete_all_by_file_sid(self, file_sid: UUID):
         query = delete(self.model).where(self.model.file_sid == file_sid)
         await self.db.execute(query)
@@ -0,0 +1,93 @@
+import os
+from pathlib import Path
+from typing import Any
+
+import torch
+from transformers import MarianMTModel
+
+from app.config.logger import logger
+from app.config.settings import project_settings
+from app.enums.translation import InferenceBackendType
+
+
+class TorchBackend:
+    name = InferenceBackendType.TORCH
+
+    def device(self) -> torch.device:
+        return torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+    def load_model(self, model_name: str) -> Any:
+        return MarianMTModel.from_pretrained(model_name).to(self.device()).eval()
+
+    def model_size(self, model: Any) -> int:
+        return sum(_tensor_bytes(value) for value in model.state_dict().values())
+
+
+class QuantizedTorchBackend(TorchBackend):
+    name = InferenceBackendType.TORCH_INT8
+
+    def device(self) -> torch.device:
+        # Динамическая int8 квантизация поддерживается только на CPU
+        return torch.device("cpu")
+
+    def load_model(self, model_name: str) -> Any:
+        model = MarianMTModel.from_pretrained(model_name).eval()
+        return torch.ao.quantization.quantize_dynamic(
+            model, {torch.nn.Linear}, dtype=torch.qint8
+        )
+
+
+class OnnxBackend:
+    name = InferenceBackendType.ONNX
+
+    def __init__(self, cache_dir: str):
+        self._cache_dir = Path(cache_dir)
+
+    def device(self) -> torch.device:
+        return torch.device("cpu")
+
+    def load_model(self, model_name: str) -> Any:
+        try:
+            from optimum.onnxruntime import ORTModelForSeq2SeqLM
+        except ImportError as e:
+            raise RuntimeError(
+                "ONNX backend requires optimum[onnxruntime] to be installed"
+            ) from e
+
+        export_path = self.export_path(model_name)
+
+        # Экспорт в ONNX выполняется один раз, затем модель читается с диска
+        if not export_path.exists():
+            logger.info(f"Export {model_name} to ONNX into {export_path}")
+            model = ORTModelForSeq2SeqLM.from_pretrained(
+                model_name, export=True, use_cache=True
+            )
+            model.save_pretrained(export_path)
+            return model
+
+        return ORTModelForSeq2SeqLM.from_pretrained(export_path, use_cache=True)
+
+    def export_path(self, model_name: str) -> Path:
+        return self._cache_dir / model_name.replace("/", "--")
+
+    def model_size(self, model: Any) -> int:
+        export_path = Path(model.model_save_dir)
+        return sum(os.path.getsize(path) for path in export_path.glob("*.onnx*"))
+
+
+def _tensor_bytes(value: Any) -> int:
+    if isinstance(value, torch.Tensor):
+        return value.numel() * value.element_size()
+    if isinstance(value, (tuple, list)):
+        return sum(_tensor_bytes(item) for item in value)
+    return 0
+
+
+def get_backend(
+    backend_type: InferenceBackendType,
+) -> TorchBackend | QuantizedTorchBackend | OnnxBackend:
+    if backend_type == InferenceBackendType.TORCH_INT8:
+        return QuantizedTorchBackend()
+    if backend_type == InferenceBackendType.ONNX:
+        return OnnxBackend(cache_dir=project_settings.TRANSLATION_ONNX_CACHE_DIR)
+    return TorchBackend()
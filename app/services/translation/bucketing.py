@@ -0,0 +1,24 @@
+def split_into_buckets(lengths: list[int], token_budget: int) -> list[list[int]]:
+    # Индексы сортируются по длине, чтобы в батч попадали строки похожей длины
+    # и паддинг до самой длинной строки батча был минимальным
+    order = sorted(range(len(lengths)), key=lambda index: lengths[index])
+
+    buckets: list[list[int]] = []
+    bucket: list[int] = []
+    bucket_max_length = 0
+
+    for index in order:
+        length = max(lengths[index], 1)
+        padded_tokens = (len(bucket) + 1) * max(bucket_max_length, length)
+
+        if bucket and padded_tokens > token_budget:
+            buckets.append(bucket)
+            bucket, bucket_max_length = [], 0
+
+        bucket.append(index)
+        bucket_max_length = max(bucket_max_length, length)
+
+    if bucket:
+        buckets.append(bucket)
+
+    return buckets
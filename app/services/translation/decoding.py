@@ -0,0 +1,41 @@
+from dataclasses import dataclass
+
+from app.config.settings import project_settings
+from app.enums.translation import DecodingProfile
+
+
+@dataclass(frozen=True)
+class DecodingParams:
+    num_beams: int
+    max_length: int
+    length_ratio: float
+    length_margin: int
+
+    @property
+    def signature(self) -> str:
+        return (
+            f"b{self.num_beams}-l{self.max_length}"
+            f"-r{self.length_ratio}-m{self.length_margin}"
+        )
+
+    def generation_max_length(self, source_length: int) -> int:
+        # Перевод UI-строк редко длиннее исходника в разы, 512 токенов не нужны
+        return min(
+            self.max_length, int(source_length * self.length_ratio) + self.length_margin
+        )
+
+
+def _params(num_beams: int) -> DecodingParams:
+    return DecodingParams(
+        num_beams=num_beams,
+        max_length=project_settings.TRANSLATION_MAX_LENGTH,
+        length_ratio=project_settings.TRANSLATION_LENGTH_RATIO,
+        length_margin=project_settings.TRANSLATION_LENGTH_MARGIN,
+    )
+
+
+DECODING_PROFILES: dict[DecodingProfile, DecodingParams] = {
+    DecodingProfile.FAST: _params(num_beams=1),
+    DecodingProfile.BALANCED: _params(num_beams=2),
+    DecodingProfile.QUALITY: _params(num_beams=5),
+}
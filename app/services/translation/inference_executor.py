@@ -0,0 +1,93 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, TypeVar
+
+import torch
+from fastapi import HTTPException
+from starlette import status
+
+from app.config.settings import project_settings
+from app.schemas.translation import InferenceExecutorStats
+
+T = TypeVar("T")
+
+
+class InferenceExecutor:
+    def __init__(
+        self,
+        max_workers: int,
+        queue_size: int,
+        torch_threads: int,
+        pipeline_workers: int,
+    ):
+        self._max_workers = max_workers
+        self._capacity = max_workers + queue_size
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="translation",
+            initializer=self._init_worker,
+            initargs=(torch_threads,),
+        )
+        # Токенизация и декодирование идут в своих потоках и не занимают генерацию
+        self._pipeline_executor = ThreadPoolExecutor(
+            max_workers=max(pipeline_workers, 1),
+            thread_name_prefix="translation-pipeline",
+        )
+        self._in_flight = 0
+
+        self.completed = 0
+        self.rejected = 0
+
+    @staticmethod
+    def _init_worker(torch_threads: int) -> None:
+        # Torch отпускает GIL во время generate, поэтому потоков достаточно,
+        # но число intra-op потоков нужно ограничить, иначе воркеры дерутся за ядра
+        if torch_threads > 0:
+            torch.set_num_threads(torch_threads)
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        if self._in_flight >= self._capacity:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Translation service is overloaded, try again later",
+                headers={"Retry-After": "1"},
+            )
+
+        self._in_flight += 1
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, partial(func, *args, **kwargs)
+            )
+        finally:
+            self._in_flight -= 1
+            self.completed += 1
+
+    async def run_pipeline(self, func: Callable[..., T], *args, **kwargs) -> T:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pipeline_executor, partial(func, *args, **kwargs)
+        )
+
+    def stats(self) -> InferenceExecutorStats:
+        return InferenceExecutorStats(
+            workers=self._max_workers,
+            capacity=self._capacity,
+            in_flight=self._in_flight,
+            completed=self.completed,
+            rejected=self.rejected,
+        )
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        self._pipeline_executor.shutdown(wait=False, cancel_futures=True)
+
+
+inference_executor = InferenceExecutor(
+    max_workers=project_settings.TRANSLATION_INFERENCE_WORKERS,
+    queue_size=project_settings.TRANSLATION_INFERENCE_QUEUE_SIZE,
+    torch_threads=project_settings.TRANSLATION_TORCH_THREADS,
+    pipeline_workers=project_settings.TRANSLATION_PIPELINE_WORKERS,
+)
@@ -0,0 +1,71 @@
+import asyncio
+import os
+
+from fastapi import HTTPException
+from starlette import status
+
+from app.config.logger import logger
+from app.config.settings import project_settings
+from app.services.translation.decoding import DecodingParams
+from app.services.translation.model_registry import unload_idle_models
+from app.services.translation.remote import read_frame, write_frame
+from app.services.translation.translation_service import TranslationService
+
+
+class InferenceServer:
+    def __init__(self, path: str):
+        self._path = path
+        # Сервер сам владеет моделями и никогда не обращается к другим серверам
+        self._service = TranslationService()
+
+    async def serve_forever(self) -> None:
+        if os.path.exists(self._path):
+            os.unlink(self._path)
+
+        await self._service.warm_up(
+            languages=project_settings.TRANSLATION_PRELOAD_LANGUAGES
+        )
+
+        server = await asyncio.start_unix_server(self._handle, path=self._path)
+        logger.info(f"Translation server is listening on {self._path}")
+
+        # Модели живут в сервере, поэтому и выгрузка по простою идёт здесь
+        unload_task = (
+            asyncio.create_task(unload_idle_models())
+            if project_settings.TRANSLATION_MODEL_IDLE_SECONDS > 0
+            else None
+        )
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if unload_task:
+                unload_task.cancel()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while request := await read_frame(reader):
+                await write_frame(writer, await self._translate(request))
+        except Exception as e:
+            logger.error(f"Translation server connection failed: {e}")
+        finally:
+            writer.close()
+
+    async def _translate(self, request: dict) -> dict:
+        # Одиночные строки всех API-воркеров попадают в общий микробатчер сервера
+        try:
+            translations = await self._service.run_model(
+                request["model"],
+                request["texts"],
+                request.get("single", False),
+                DecodingParams(**request["params"]),
+            )
+        except HTTPException as e:
+            return {"error": e.detail, "status": e.status_code}
+        except Exception as e:
+            logger.error(f"Ошибка при переводе: {e}")
+            return {"error": str(e), "status": status.HTTP_500_INTERNAL_SERVER_ERROR}
+
+        return {"translations": translations}
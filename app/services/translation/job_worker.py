@@ -0,0 +1,113 @@
+import asyncio
+
+from redis.exceptions import RedisError
+
+from app.config.db.postgres.session import postgres_session
+from app.config.logger import logger
+from app.config.settings import project_settings
+from app.schemas.line import TranslationMLLine
+from app.schemas.translation import TranslationJob
+from app.services.line_service import LineService
+from app.services.translation.jobs import (
+    JobLeaseLostError,
+    TranslationJobQueue,
+    translation_job_queue,
+)
+from app.services.translation.translation_service import translation_service
+
+
+class TranslationJobWorker:
+    def __init__(self, queue: TranslationJobQueue, chunk_size: int, poll_timeout: int):
+        self._queue = queue
+        self._chunk_size = chunk_size
+        self._poll_timeout = poll_timeout
+
+    async def run_forever(self) -> None:
+        logger.info("Translation worker started")
+        while True:
+            # Задачи упавших воркеров возвращаются в очередь по истечении аренды
+            await self._queue.requeue_expired()
+
+            claimed = await self._queue.dequeue(timeout=self._poll_timeout)
+            if claimed is None:
+                continue
+
+            job, lease = claimed
+            processing = asyncio.create_task(self.process(job, lease))
+            heartbeat = asyncio.create_task(
+                self._heartbeat(job.job_id, lease, processing)
+            )
+            try:
+                await asyncio.wait({processing})
+            finally:
+                heartbeat.cancel()
+                processing.cancel()
+
+    async def _heartbeat(
+        self, job_id: str, lease: str, processing: asyncio.Task
+    ) -> None:
+        while True:
+            await asyncio.sleep(self._queue.lease_seconds / 3)
+            try:
+                await self._queue.heartbeat(job_id, lease)
+            except JobLeaseLostError:
+                # Задачу уже перезапустил другой воркер, эта попытка не нужна
+                logger.warning(f"Lease of job {job_id} was lost, stop processing")
+                processing.cancel()
+                return
+            except RedisError as e:
+                logger.warning(f"Failed to extend lease of job {job_id}: {e}")
+
+    async def process(self, job: TranslationJob, lease: str) -> None:
+        logger.info(f"Start translation job {job.job_id} for file {job.file_sid}")
+
+        try:
+            async with postgres_session() as db:
+                lines = await LineService(db).get_all_lines_by_file_sid(
+                    file_sid=job.file_sid
+                )
+
+            await self._queue.start(job.job_id, lease, total=len(lines))
+
+            # Результаты сохраняются по частям, чтобы был виден прогресс
+            for start in range(0, len(lines), self._chunk_size):
+                chunk = lines[start : start + self._chunk_size]
+                translations, _ = await translation_service.translate_deduplicated(
+                    texts=[line.meaning for line in chunk],
+                    language=job.language,
+                    profile=job.profile,
+                )
+
+                if len(translations) != len(chunk):
+                    raise RuntimeError("Translation model returned no result")
+
+                await self._queue.add_results(
+                    job.job_id,
+                    lease,
+                    [
+                        TranslationMLLine(
+                            sid=line.sid, meaning=line.meaning, translation=translation
+                        )
+                        for line, translation in zip(chunk, translations)
+                    ],
+                )
+
+            await self._queue.finish(job.job_id, lease)
+            logger.info(f"Finish translation job {job.job_id}")
+
+        except JobLeaseLostError as e:
+            logger.warning(f"Stop translation job {job.job_id}: {e}")
+
+        except Exception as e:
+            logger.error(f"Translation job {job.job_id} failed: {e}")
+            try:
+                await self._queue.fail(job.job_id, lease, error=str(e))
+            except JobLeaseLostError:
+                pass
+
+
+translation_job_worker = TranslationJobWorker(
+    queue=translation_job_queue,
+    chunk_size=project_settings.TRANSLATION_JOB_CHUNK_SIZE,
+    poll_timeout=project_settings.TRANSLATION_JOB_POLL_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,299 @@
+import json
+import time
+from typing import Callable
+from uuid import UUID, uuid4
+
+from redis.asyncio import Redis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import WatchError
+
+from app.config.db.redis.session import redis_conn
+from app.config.settings import project_settings
+from app.enums.translation import DecodingProfile, TranslationJobStatus
+from app.schemas.line import TranslationMLLine
+from app.schemas.translation import TranslationJob
+
+
+class JobLeaseLostError(Exception):
+    pass
+
+
+class TranslationJobQueue:
+    queue_key = "translation:jobs:queue"
+    processing_key = "translation:jobs:processing"
+    leases_key = "translation:jobs:leases"
+
+    def __init__(
+        self, redis: Redis, ttl_seconds: int, lease_seconds: int, max_attempts: int
+    ):
+        self._redis = redis
+        self._ttl_seconds = ttl_seconds
+        self._lease_seconds = lease_seconds
+        self._max_attempts = max_attempts
+
+    @property
+    def lease_seconds(self) -> int:
+        return self._lease_seconds
+
+    @staticmethod
+    def _job_key(job_id: str) -> str:
+        return f"translation:job:{job_id}"
+
+    @staticmethod
+    def _results_key(job_id: str) -> str:
+        return f"translation:job:{job_id}:results"
+
+    @staticmethod
+    def _file_key(file_sid: UUID, language: str, profile: DecodingProfile) -> str:
+        return f"translation:job:file:{file_sid}:{language}:{profile}"
+
+    async def enqueue(
+        self, file_sid: UUID, language: str, profile: DecodingProfile
+    ) -> TranslationJob:
+        file_key = self._file_key(file_sid, language, profile)
+        job = TranslationJob(
+            job_id=uuid4().hex,
+            file_sid=file_sid,
+            language=language,
+            profile=profile,
+            status=TranslationJobStatus.QUEUED,
+            done=0,
+            total=0,
+        )
+
+        async with self._redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    # Пока задача по файлу и языку не завершена, повторный запрос
+                    # вернёт её же. WATCH не даёт двум запросам создать по задаче
+                    await pipe.watch(file_key)
+                    existing = await self.get(await pipe.get(file_key) or "")
+                    if existing and existing.status in (
+                        TranslationJobStatus.QUEUED,
+                        TranslationJobStatus.RUNNING,
+                    ):
+                        return existing
+
+                    pipe.multi()
+                    pipe.hset(self._job_key(job.job_id), mapping=self._dump(job))
+                    pipe.expire(self._job_key(job.job_id), self._ttl_seconds)
+                    pipe.set(file_key, job.job_id, ex=self._ttl_seconds)
+                    pipe.lpush(self.queue_key, job.job_id)
+                    await pipe.execute()
+                    return job
+                except WatchError:
+                    continue
+
+    async def dequeue(self, timeout: int) -> tuple[TranslationJob, str] | None:
+        # Задача остаётся в списке обрабатываемых, пока воркер продлевает аренду
+        job_id = await self._redis.blmove(
+            self.queue_key, self.processing_key, timeout, "RIGHT", "LEFT"
+        )
+        if not job_id:
+            return None
+
+        job = await self.get(job_id)
+        if job is None:
+            await self._release(job_id)
+            return None
+
+        # Токен аренды отличает текущую попытку от воркера, у которого
+        # задачу уже забрали
+        lease = uuid4().hex
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.hset(self._job_key(job_id), "lease", lease)
+            pipe.zadd(self.leases_key, {job_id: time.time() + self._lease_seconds})
+            await pipe.execute()
+
+        return job, lease
+
+    async def heartbeat(self, job_id: str, lease: str) -> None:
+        await self._fenced(
+            job_id,
+            lease,
+            lambda pipe: pipe.zadd(
+                self.leases_key, {job_id: time.time() + self._lease_seconds}
+            ),
+        )
+
+    async def _fenced(
+        self, job_id: str, lease: str, write: Callable[[Pipeline], object]
+    ) -> None:
+        # Запись проходит, только пока аренда принадлежит этому воркеру
+        async with self._redis.pipeline(transaction=True) as pipe:
+            while True:
+                try:
+                    await pipe.watch(self._job_key(job_id))
+                    if await pipe.hget(self._job_key(job_id), "lease") != lease:
+                        raise JobLeaseLostError(f"Lease of job {job_id} was lost")
+
+                    pipe.multi()
+                    write(pipe)
+                    await pipe.execute()
+                    return
+                except WatchError:
+                    continue
+
+    async def requeue_expired(self) -> None:
+        now = time.time()
+        for job_id in await self._redis.lrange(self.processing_key, 0, -1):
+            await self._requeue_if_expired(job_id, now)
+
+    async def _requeue_if_expired(self, job_id: str, now: float) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            try:
+                # Продление аренды другим воркером отменит транзакцию,
+                # задача проверится при следующем обходе
+                await pipe.watch(self.leases_key)
+                deadline = await pipe.zscore(self.leases_key, job_id)
+
+                if deadline is None:
+                    # Воркер только что взял задачу и ещё не успел выставить аренду
+                    pipe.multi()
+                    pipe.zadd(
+                        self.leases_key, {job_id: now + self._lease_seconds}, nx=True
+                    )
+                    await pipe.execute()
+                    return
+
+                if deadline > now:
+                    return
+
+                lost = int(await pipe.hget(self._job_key(job_id), "lost") or 0)
+                exists = await pipe.exists(self._job_key(job_id))
+
+                pipe.multi()
+                pipe.lrem(self.processing_key, 1, job_id)
+                pipe.zrem(self.leases_key, job_id)
+                if not exists:
+                    await pipe.execute()
+                    return
+
+                # Воркер пропал: задача перезапускается с начала, а его запись
+                # с прежним токеном аренды больше не пройдёт
+                pipe.delete(self._results_key(job_id))
+                pipe.hdel(self._job_key(job_id), "lease")
+                if lost + 1 >= self._max_attempts:
+                    pipe.hset(
+                        self._job_key(job_id),
+                        mapping={
+                            "status": TranslationJobStatus.FAILED.value,
+                            "error": "Translation worker was lost",
+                        },
+                    )
+                else:
+                    pipe.hset(
+                        self._job_key(job_id),
+                        mapping={
+                            "status": TranslationJobStatus.QUEUED.value,
+                            "done": 0,
+                            "total": 0,
+                            "lost": lost + 1,
+                        },
+                    )
+                    pipe.rpush(self.queue_key, job_id)
+                await pipe.execute()
+            except WatchError:
+                return
+
+    async def _release(self, job_id: str) -> None:
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.lrem(self.processing_key, 1, job_id)
+            pipe.zrem(self.leases_key, job_id)
+            await pipe.execute()
+
+    async def get(self, job_id: str) -> TranslationJob | None:
+        data = await self._redis.hgetall(self._job_key(job_id))
+        if not data:
+            return None
+
+        return TranslationJob(
+            job_id=data["job_id"],
+            file_sid=data["file_sid"],
+            language=data["language"],
+            profile=data["profile"],
+            status=data["status"],
+            done=int(data["done"]),
+            total=int(data["total"]),
+            error=data.get("error") or None,
+        )
+
+    async def start(self, job_id: str, lease: str, total: int) -> None:
+        await self._fenced(
+            job_id,
+            lease,
+            lambda pipe: pipe.hset(
+                self._job_key(job_id),
+                mapping={"status": TranslationJobStatus.RUNNING.value, "total": total},
+            ),
+        )
+
+    async def add_results(
+        self, job_id: str, lease: str, lines: list[TranslationMLLine]
+    ) -> None:
+        if not lines:
+            return
+
+        def write(pipe: Pipeline) -> None:
+            pipe.rpush(
+                self._results_key(job_id),
+                *[line.model_dump_json() for line in lines],
+            )
+            pipe.expire(self._results_key(job_id), self._ttl_seconds)
+            pipe.hincrby(self._job_key(job_id), "done", len(lines))
+
+        await self._fenced(job_id, lease, write)
+
+    async def finish(self, job_id: str, lease: str) -> None:
+        await self._fenced(
+            job_id,
+            lease,
+            lambda pipe: self._complete(
+                pipe, job_id, {"status": TranslationJobStatus.DONE.value}
+            ),
+        )
+
+    async def fail(self, job_id: str, lease: str, error: str) -> None:
+        await self._fenced(
+            job_id,
+            lease,
+            lambda pipe: self._complete(
+                pipe,
+                job_id,
+                {"status": TranslationJobStatus.FAILED.value, "error": error},
+            ),
+        )
+
+    def _complete(self, pipe: Pipeline, job_id: str, mapping: dict) -> None:
+        pipe.hset(self._job_key(job_id), mapping=mapping)
+        pipe.hdel(self._job_key(job_id), "lease")
+        pipe.lrem(self.processing_key, 1, job_id)
+        pipe.zrem(self.leases_key, job_id)
+
+    async def get_results(
+        self, job_id: str, offset: int = 0, limit: int | None = None
+    ) -> list[TranslationMLLine]:
+        end = -1 if limit is None else offset + limit - 1
+        items = await self._redis.lrange(self._results_key(job_id), offset, end)
+        return [TranslationMLLine(**json.loads(item)) for item in items]
+
+    @staticmethod
+    def _dump(job: TranslationJob) -> dict:
+        return {
+            "job_id": job.job_id,
+            "file_sid": str(job.file_sid),
+            "language": job.language,
+            "profile": job.profile.value,
+            "status": job.status.value,
+            "done": job.done,
+            "total": job.total,
+            "error": job.error or "",
+        }
+
+
+translation_job_queue = TranslationJobQueue(
+    redis=redis_conn,
+    ttl_seconds=project_settings.TRANSLATION_JOB_TTL_SECONDS,
+    lease_seconds=project_settings.TRANSLATION_JOB_LEASE_SECONDS,
+    max_attempts=project_settings.TRANSLATION_JOB_MAX_ATTEMPTS,
+)
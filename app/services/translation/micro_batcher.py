@@ -0,0 +1,72 @@
+import asyncio
+from typing import Awaitable, Callable
+
+from app.schemas.translation import MicroBatcherStats
+
+
+class MicroBatcher:
+    def __init__(
+        self,
+        run_batch: Callable[[list[str]], Awaitable[list[str]]],
+        max_size: int,
+        window_ms: int,
+    ):
+        self._run_batch = run_batch
+        self._max_size = max_size
+        self._window = window_ms / 1000
+        self._pending: list[tuple[str, asyncio.Future]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._tasks: set[asyncio.Task] = set()
+
+        self.batches = 0
+        self.items = 0
+
+    async def submit(self, text: str) -> str:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= self._max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self._window, self._flush)
+
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, []
+        if not batch:
+            return
+
+        task = asyncio.create_task(self._run(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: list[tuple[str, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+
+        try:
+            results = await self._run_batch([text for text, _ in batch])
+            if len(results) != len(batch):
+                raise RuntimeError("Translation batch returned wrong number of results")
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for (_, future), result in zip(batch, results):
+            if not future.done():
+                future.set_result(result)
+
+    def stats(self) -> MicroBatcherStats:
+        return MicroBatcherStats(
+            batches=self.batches,
+            items=self.items,
+            pending=len(self._pending),
+        )
@@ -0,0 +1,212 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any
+
+import torch
+from transformers import MarianTokenizer
+
+from app.config.logger import logger
+from app.config.settings import project_settings
+from app.schemas.translation import ModelRegistryStats, ModelResidency
+from app.services.translation.backends import (
+    OnnxBackend,
+    QuantizedTorchBackend,
+    TorchBackend,
+    get_backend,
+)
+
+
+@dataclass
+class LoadedModel:
+    name: str
+    tokenizer: MarianTokenizer
+    model: Any
+    device: torch.device
+    size_bytes: int
+    last_used: float = field(default_factory=time.monotonic)
+
+
+class ModelRegistry:
+    def __init__(
+        self,
+        backend: TorchBackend | QuantizedTorchBackend | OnnxBackend,
+        memory_budget_mb: int,
+        share_memory: bool = False,
+    ):
+        self._backend = backend
+        self._memory_budget_bytes = memory_budget_mb * 1024 * 1024
+        self._share_memory = share_memory
+        self._models: OrderedDict[str, LoadedModel] = OrderedDict()
+        self._pinned: set[str] = set()
+        self._lock = threading.Lock()
+        self._load_locks: dict[str, threading.Lock] = {}
+
+        self.loads = 0
+        self.hits = 0
+        self.evictions = 0
+        self.idle_evictions = 0
+
+    @property
+    def device(self) -> torch.device:
+        return self._backend.device()
+
+    def get(self, model_name: str) -> LoadedModel:
+        with self._lock:
+            loaded = self._lookup(model_name)
+            if loaded:
+                return loaded
+            load_lock = self._load_locks.setdefault(model_name, threading.Lock())
+
+        # Загрузка одной модели не блокирует обращения к уже загруженным
+        with load_lock:
+            with self._lock:
+                loaded = self._lookup(model_name)
+                if loaded:
+                    return loaded
+
+            loaded = self._load(model_name)
+
+            with self._lock:
+                self._models[model_name] = loaded
+                self.loads += 1
+                self._evict_over_budget(keep=model_name)
+
+        return loaded
+
+    def put(
+        self, model_name: str, tokenizer: MarianTokenizer, model: Any
+    ) -> LoadedModel:
+        loaded = self._wrap(model_name, tokenizer, model)
+        with self._lock:
+            self._models[model_name] = loaded
+            self._evict_over_budget(keep=model_name)
+        return loaded
+
+    def evict(self, model_name: str) -> bool:
+        with self._lock:
+            if model_name not in self._models:
+                return False
+            self._remove(model_name)
+            return True
+
+    def evict_idle(self, idle_seconds: float) -> list[str]:
+        # Закреплённые (прогретые при старте) модели не выгружаются по простою
+        now = time.monotonic()
+        with self._lock:
+            idle = [
+                name
+                for name, loaded in self._models.items()
+                if name not in self._pinned and now - loaded.last_used > idle_seconds
+            ]
+            for name in idle:
+                self._remove(name)
+                self.idle_evictions += 1
+        return idle
+
+    def pin(self, model_name: str) -> None:
+        with self._lock:
+            self._pinned.add(model_name)
+
+    def is_loaded(self, model_name: str) -> bool:
+        with self._lock:
+            return model_name in self._models
+
+    def stats(self) -> ModelRegistryStats:
+        now = time.monotonic()
+        with self._lock:
+            return ModelRegistryStats(
+                backend=self._backend.name,
+                loads=self.loads,
+                hits=self.hits,
+                evictions=self.evictions,
+                idle_evictions=self.idle_evictions,
+                memory_budget_bytes=self._memory_budget_bytes,
+                resident_bytes=self._resident_bytes(),
+                models=list(self._models),
+                residency=[
+                    ModelResidency(
+                        name=name,
+                        size_bytes=loaded.size_bytes,
+                        idle_seconds=round(now - loaded.last_used, 3),
+                        pinned=name in self._pinned,
+                    )
+                    for name, loaded in self._models.items()
+                ],
+            )
+
+    def _lookup(self, model_name: str) -> LoadedModel | None:
+        loaded = self._models.get(model_name)
+        if loaded:
+            self._models.move_to_end(model_name)
+            loaded.last_used = time.monotonic()
+            self.hits += 1
+        return loaded
+
+    def _load(self, model_name: str) -> LoadedModel:
+        logger.info(f"Load translation model {model_name} ({self._backend.name})")
+        tokenizer = MarianTokenizer.from_pretrained(model_name)
+        model = self._backend.load_model(model_name)
+        return self._wrap(model_name, tokenizer, model)
+
+    def _wrap(
+        self, model_name: str, tokenizer: MarianTokenizer, model: Any
+    ) -> LoadedModel:
+        # Веса в разделяемой памяти не копируются в форкнутые воркеры
+        if self._share_memory and isinstance(model, torch.nn.Module):
+            model.share_memory()
+
+        return LoadedModel(
+            name=model_name,
+            tokenizer=tokenizer,
+            model=model,
+            device=self.device,
+            size_bytes=self._backend.model_size(model),
+        )
+
+    def _evict_over_budget(self, keep: str) -> None:
+        while self._resident_bytes() > self._memory_budget_bytes:
+            # Закреплённые модели не вытесняются и холодными языками
+            candidate = next(
+                (
+                    name
+                    for name in self._models
+                    if name != keep and name not in self._pinned
+                ),
+                None,
+            )
+            if candidate is None:
+                logger.warning(
+                    "Translation models memory budget is too small: "
+                    f"{self._resident_bytes()} bytes are resident, "
+                    f"{self._memory_budget_bytes} bytes allowed"
+                )
+                break
+            self._remove(candidate)
+            # Выгрузки по простою считаются отдельно, в idle_evictions
+            self.evictions += 1
+
+    def _remove(self, model_name: str) -> None:
+        logger.info(f"Unload translation model {model_name}")
+        del self._models[model_name]
+
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
+    def _resident_bytes(self) -> int:
+        return sum(loaded.size_bytes for loaded in self._models.values())
+
+
+model_registry = ModelRegistry(
+    backend=get_backend(project_settings.TRANSLATION_BACKEND),
+    memory_budget_mb=project_settings.TRANSLATION_MODELS_MEMORY_BUDGET_MB,
+    share_memory=project_settings.TRANSLATION_SHARE_MEMORY,
+)
+
+
+async def unload_idle_models() -> None:
+    while True:
+        await asyncio.sleep(project_settings.TRANSLATION_MODEL_IDLE_CHECK_SECONDS)
+        model_registry.evict_idle(project_settings.TRANSLATION_MODEL_IDLE_SECONDS)
@@ -0,0 +1,129 @@
+import asyncio
+from typing import AsyncIterator
+
+import torch
+from transformers import BatchEncoding
+
+from app.services.translation.bucketing import split_into_buckets
+from app.services.translation.decoding import DecodingParams
+from app.services.translation.inference_executor import inference_executor
+from app.services.translation.model_registry import model_registry
+
+DONE = object()
+
+
+def tokenize(model_name: str, texts: list[str], max_length: int) -> list[list[int]]:
+    tokenizer = model_registry.get(model_name).tokenizer
+    return tokenizer(texts, truncation=True, max_length=max_length)["input_ids"]
+
+
+def pad(model_name: str, input_ids: list[list[int]]) -> BatchEncoding:
+    tokenizer = model_registry.get(model_name).tokenizer
+    return tokenizer.pad({"input_ids": input_ids}, return_tensors="pt")
+
+
+def generate_tokens(
+    model_name: str, inputs: BatchEncoding, params: DecodingParams
+) -> torch.Tensor:
+    loaded = model_registry.get(model_name)
+    inputs = inputs.to(loaded.device)
+
+    # Длина перевода ограничивается по длине исходных строк батча
+    return loaded.model.generate(
+        **inputs,
+        num_beams=params.num_beams,
+        early_stopping=params.num_beams > 1,
+        max_length=params.generation_max_length(inputs["input_ids"].shape[1]),
+    )
+
+
+def decode(model_name: str, tokens: torch.Tensor) -> list[str]:
+    tokenizer = model_registry.get(model_name).tokenizer
+    return tokenizer.batch_decode(tokens, skip_special_tokens=True)
+
+
+class BulkTranslationPipeline:
+    def __init__(
+        self,
+        model_name: str,
+        params: DecodingParams,
+        window_size: int,
+        token_budget: int,
+    ):
+        self._model_name = model_name
+        self._params = params
+        self._window_size = window_size
+        # Beam search умножает батч на num_beams, это учитывается в бюджете
+        self._token_budget = max(token_budget // params.num_beams, 1)
+
+    async def run(self, texts: list[str]) -> AsyncIterator[tuple[list[int], list[str]]]:
+        # Токенизация бакета N+1 и декодирование N-1 идут, пока генерируется N
+        encoded: asyncio.Queue = asyncio.Queue(maxsize=2)
+        generated: asyncio.Queue = asyncio.Queue(maxsize=2)
+
+        stages = [
+            asyncio.create_task(self._encode(texts, encoded)),
+            asyncio.create_task(self._generate(encoded, generated)),
+        ]
+
+        try:
+            while (item := await generated.get()) is not DONE:
+                if isinstance(item, BaseException):
+                    raise item
+
+                bucket, tokens = item
+                translated = await inference_executor.run_pipeline(
+                    decode, self._model_name, tokens
+                )
+                yield bucket, translated
+        finally:
+            for stage in stages:
+                stage.cancel()
+
+    async def _encode(self, texts: list[str], output: asyncio.Queue) -> None:
+        # Строки заранее сортируются по числу символов, поэтому токенизировать
+        # можно окнами, не дожидаясь токенизации всего файла
+        order = sorted(range(len(texts)), key=lambda index: len(texts[index]))
+
+        try:
+            for start in range(0, len(order), self._window_size):
+                window = order[start : start + self._window_size]
+                input_ids = await inference_executor.run_pipeline(
+                    tokenize,
+                    self._model_name,
+                    [texts[index] for index in window],
+                    self._params.max_length,
+                )
+
+                lengths = [len(ids) for ids in input_ids]
+                for bucket in split_into_buckets(lengths, self._token_budget):
+                    inputs = await inference_executor.run_pipeline(
+                        pad, self._model_name, [input_ids[i] for i in bucket]
+                    )
+                    await output.put(([window[i] for i in bucket], inputs))
+        except Exception as e:
+            await output.put(e)
+            return
+
+        await output.put(DONE)
+
+    async def _generate(self, source: asyncio.Queue, output: asyncio.Queue) -> None:
+        while (item := await source.get()) is not DONE:
+            if isinstance(item, BaseException):
+                await output.put(item)
+                return
+
+            bucket, inputs = item
+            try:
+                # Каждый бакет - отдельная задача, чтобы между ними успевали
+                # другие запросы
+                tokens = await inference_executor.run(
+                    generate_tokens, self._model_name, inputs, self._params
+                )
+            except Exception as e:
+                await output.put(e)
+                return
+
+            await output.put((bucket, tokens))
+
+        await output.put(DONE)
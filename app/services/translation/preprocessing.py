@@ -0,0 +1,65 @@
+import re
+from dataclasses import dataclass
+
+from app.enums.translation import PreprocessAction
+
+# Qt (%1, %L1, %n), printf (%s, %.2f), именованные ({name}, {0}), HTML-теги и сущности
+PLACEHOLDER_RE = re.compile(
+    r"%L?\d+|%n|%[-+#0]*\d*(?:\.\d+)?[sdifuxXeEgGc]|\{[^{}\s]*\}|<[^<>]+>|&#?\w+;"
+)
+MASK_RE = re.compile(r"\{(\d+)\}")
+# Модели переводят с русского: строка без кириллицы уже не требует перевода
+SOURCE_LETTERS_RE = re.compile(r"[А-Яа-яЁё]")
+
+
+@dataclass(frozen=True)
+class PreparedText:
+    action: PreprocessAction
+    text: str
+    placeholders: tuple[str, ...] = ()
+
+
+def prepare_text(text: str) -> PreparedText:
+    if not text.strip():
+        return PreparedText(action=PreprocessAction.SKIP, text=text)
+
+    placeholders: list[str] = []
+
+    def mask(match: re.Match) -> str:
+        placeholders.append(match.group(0))
+        return f"{{{len(placeholders) - 1}}}"
+
+    masked = PLACEHOLDER_RE.sub(mask, text)
+
+    if not SOURCE_LETTERS_RE.search(masked):
+        return PreparedText(action=PreprocessAction.COPY, text=text)
+
+    return PreparedText(
+        action=PreprocessAction.TRANSLATE,
+        text=masked,
+        placeholders=tuple(placeholders),
+    )
+
+
+def restore_text(translation: str, prepared: PreparedText) -> str:
+    if prepared.action != PreprocessAction.TRANSLATE:
+        return prepared.text
+
+    restored: set[int] = set()
+
+    def unmask(match: re.Match) -> str:
+        index = int(match.group(1))
+        if index >= len(prepared.placeholders):
+            return match.group(0)
+        restored.add(index)
+        return prepared.placeholders[index]
+
+    result = MASK_RE.sub(unmask, translation)
+
+    # Если модель потеряла плейсхолдер, он дописывается в конец, а не теряется
+    missing = [
+        placeholder
+        for index, placeholder in enumerate(prepared.placeholders)
+        if index not in restored
+    ]
+    return " ".join([result, *missing]) if missing else result
@@ -0,0 +1,94 @@
+import asyncio
+import itertools
+import json
+import struct
+from dataclasses import asdict
+
+from fastapi import HTTPException
+from starlette import status
+
+from app.config.settings import project_settings
+from app.services.translation.decoding import DecodingParams
+
+HEADER = struct.Struct(">I")
+MAX_FRAME_BYTES = 64 * 1024 * 1024
+
+
+async def read_frame(reader: asyncio.StreamReader) -> dict | None:
+    try:
+        header = await reader.readexactly(HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+
+    (size,) = HEADER.unpack(header)
+    if size > MAX_FRAME_BYTES:
+        raise ValueError(f"Frame is too large: {size} bytes")
+
+    return json.loads(await reader.readexactly(size))
+
+
+async def write_frame(writer: asyncio.StreamWriter, payload: dict) -> None:
+    data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    writer.write(HEADER.pack(len(data)) + data)
+    await writer.drain()
+
+
+class RemoteInference:
+    def __init__(self, sockets: list[str], timeout_seconds: float):
+        self._sockets = sockets
+        self._next_socket = itertools.cycle(sockets)
+        self._timeout = timeout_seconds
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._sockets)
+
+    async def translate(
+        self,
+        model_name: str,
+        texts: list[str],
+        params: DecodingParams,
+        single: bool = False,
+    ) -> list[str]:
+        # Серверы инференса в пуле равноправны, запросы раздаются по кругу
+        path = next(self._next_socket)
+        request = {
+            "model": model_name,
+            "texts": texts,
+            "params": asdict(params),
+            "single": single,
+        }
+
+        try:
+            async with asyncio.timeout(self._timeout):
+                reader, writer = await asyncio.open_unix_connection(path)
+                try:
+                    await write_frame(writer, request)
+                    response = await read_frame(reader)
+                finally:
+                    writer.close()
+        except (OSError, TimeoutError) as e:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail=f"Translation server is unavailable: {e}",
+                headers={"Retry-After": "1"},
+            )
+
+        if response is None:
+            raise RuntimeError("Translation server closed the connection")
+
+        if "error" in response:
+            raise HTTPException(
+                status_code=response.get(
+                    "status", status.HTTP_500_INTERNAL_SERVER_ERROR
+                ),
+                detail=response["error"],
+            )
+
+        return response["translations"]
+
+
+remote_inference = RemoteInference(
+    sockets=project_settings.TRANSLATION_SERVER_SOCKETS,
+    timeout_seconds=project_settings.TRANSLATION_SERVER_TIMEOUT_SECONDS,
+)
@@ -0,0 +1,114 @@
+import hashlib
+import unicodedata
+from collections import OrderedDict
+
+from redis.asyncio import Redis
+from redis.exceptions import RedisError
+
+from app.config.db.redis.session import redis_conn
+from app.config.logger import logger
+from app.config.settings import project_settings
+from app.schemas.translation import TranslationMemoryStats
+
+
+class TranslationMemory:
+    def __init__(
+        self,
+        redis: Redis,
+        max_size: int,
+        ttl_seconds: int,
+        version: str,
+        backend: str,
+    ):
+        self._redis = redis
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._version = version
+        self._backend = backend
+        self._local: OrderedDict[str, str] = OrderedDict()
+
+        self.local_hits = 0
+        self.redis_hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return unicodedata.normalize("NFC", " ".join(text.split()))
+
+    def key(self, model_name: str, text: str, decoding: str) -> str:
+        # Параметры генерации и бэкенд входят в ключ: переводы fp32, int8 и ONNX
+        # различаются и не должны подменять друг друга в общем Redis
+        raw = "\x00".join([model_name, self._backend, decoding, self.normalize(text)])
+        digest = hashlib.sha256(raw.encode("utf-8")).hexdigest()
+        return f"translation:memory:{self._version}:{digest}"
+
+    async def get_many(self, keys: list[str]) -> dict[str, str]:
+        found: dict[str, str] = {}
+        remote_keys = []
+
+        for key in dict.fromkeys(keys):
+            if key in self._local:
+                self._local.move_to_end(key)
+                found[key] = self._local[key]
+                self.local_hits += 1
+            else:
+                remote_keys.append(key)
+
+        if not remote_keys:
+            return found
+
+        try:
+            values = await self._redis.mget(remote_keys)
+        except RedisError as e:
+            logger.warning(f"Translation memory is unavailable: {e}")
+            values = [None] * len(remote_keys)
+
+        for key, value in zip(remote_keys, values):
+            if value is None:
+                self.misses += 1
+                continue
+
+            found[key] = value
+            self._remember(key, value)
+            self.redis_hits += 1
+
+        return found
+
+    async def set_many(self, items: dict[str, str]) -> None:
+        if not items:
+            return
+
+        for key, value in items.items():
+            self._remember(key, value)
+
+        try:
+            async with self._redis.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.setex(name=key, time=self._ttl_seconds, value=value)
+                await pipe.execute()
+        except RedisError as e:
+            logger.warning(f"Translation memory is unavailable: {e}")
+
+    def _remember(self, key: str, value: str) -> None:
+        self._local[key] = value
+        self._local.move_to_end(key)
+
+        while len(self._local) > self._max_size:
+            self._local.popitem(last=False)
+
+    def stats(self) -> TranslationMemoryStats:
+        return TranslationMemoryStats(
+            local_hits=self.local_hits,
+            redis_hits=self.redis_hits,
+            misses=self.misses,
+            local_size=len(self._local),
+        )
+
+
+translation_memory = TranslationMemory(
+    redis=redis_conn,
+    max_size=project_settings.TRANSLATION_CACHE_SIZE,
+    ttl_seconds=project_settings.TRANSLATION_CACHE_TTL_SECONDS,
+    version=project_settings.TRANSLATION_CACHE_VERSION,
+    backend=project_settings.TRANSLATION_BACKEND.value,
+)
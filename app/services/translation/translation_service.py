@@ -1,13 +1,42 @@
-from typing import Annotated
+import asyncio
+from typing import Annotated, AsyncIterator
 
-import torch
-from fastapi import Depends
-from transformers import MarianMTModel, MarianTokenizer
+from fastapi import Depends, HTTPException
 
+from app.config.logger import logger
+from app.config.settings import project_settings
 from app.enums.language import LanguageEnums
+from app.enums.translation import DecodingProfile, PreprocessAction
+from app.schemas.translation import MicroBatcherStats, PreprocessingStats
+from app.services.translation.decoding import DECODING_PROFILES, DecodingParams
+from app.services.translation.inference_executor import inference_executor
+from app.services.translation.micro_batcher import MicroBatcher
+from app.services.translation.model_registry import model_registry
+from app.services.translation.pipeline import (
+    BulkTranslationPipeline,
+    decode,
+    generate_tokens,
+)
+from app.services.translation.preprocessing import (
+    PreparedText,
+    prepare_text,
+    restore_text,
+)
+from app.services.translation.remote import RemoteInference, remote_inference
+from app.services.translation.translation_memory import translation_memory
 
 
 class TranslationService:
+    def __init__(self, remote: RemoteInference | None = None):
+        self._remote = remote
+        self._batchers: dict[tuple[str, DecodingParams], MicroBatcher] = {}
+
+        self.deduplicated = 0
+        self.skipped = 0
+        self.copied = 0
+        self.masked = 0
+        self.ready = False
+        self.warm_up_failed = False
 
     def _resolve_translation_language_in_file(self, language: str) -> LanguageEnums:
         handle_language = {
@@ -22,59 +51,350 @@ class TranslationService:
 
         return handle_language[language]
 
+    def _generate(
+        self,
+        model_name: str,
+        texts: str | list[str],
+        params: DecodingParams,
+    ) -> list[str]:
+        # Токенизатор и модель загружаются один раз на процесс
+        tokenizer = model_registry.get(model_name).tokenizer
+
+        # Токенизация входных текстов с учётом максимальной длины
+        inputs = tokenizer(
+            texts,
+            return_tensors="pt",
+            padding=True,
+            truncation=True,
+            max_length=params.max_length,
+        )
+
+        translated_tokens = generate_tokens(model_name, inputs, params)
+        return decode(model_name, translated_tokens)
+
+    async def _iter_buckets(
+        self,
+        model_name: str,
+        texts: list[str],
+        params: DecodingParams,
+    ) -> AsyncIterator[tuple[list[int], list[str]]]:
+        if not texts:
+            return
+
+        # Токенизатор есть только у сервера инференса, бакеты собирает он
+        if self._remote:
+            chunk_size = project_settings.TRANSLATION_JOB_CHUNK_SIZE
+            for start in range(0, len(texts), chunk_size):
+                bucket = list(range(start, min(start + chunk_size, len(texts))))
+                translated = await self._remote.translate(
+                    model_name, texts[start : start + chunk_size], params
+                )
+                yield bucket, translated
+            return
+
+        pipeline = BulkTranslationPipeline(
+            model_name=model_name,
+            params=params,
+            window_size=project_settings.TRANSLATION_PIPELINE_WINDOW_SIZE,
+            token_budget=project_settings.TRANSLATION_BATCH_TOKEN_BUDGET,
+        )
+        async for bucket, translated in pipeline.run(texts):
+            yield bucket, translated
+
+    async def _translate_in_buckets(
+        self,
+        model_name: str,
+        texts: list[str],
+        params: DecodingParams,
+    ) -> list[str]:
+        translations: list[str | None] = [None] * len(texts)
+
+        async for bucket, translated in self._iter_buckets(model_name, texts, params):
+            for index, translation in zip(bucket, translated):
+                translations[index] = translation
+
+        return translations
+
+    def _get_batcher(self, model_name: str, params: DecodingParams) -> MicroBatcher:
+        key = (model_name, params)
+
+        if key not in self._batchers:
+
+            async def run_batch(texts: list[str]) -> list[str]:
+                if self._remote:
+                    return await self._remote.translate(
+                        model_name, texts, params, single=True
+                    )
+                return await inference_executor.run(
+                    self._generate, model_name, texts, params
+                )
+
+            self._batchers[key] = MicroBatcher(
+                run_batch=run_batch,
+                max_size=project_settings.TRANSLATION_BATCH_MAX_SIZE,
+                window_ms=project_settings.TRANSLATION_BATCH_WINDOW_MS,
+            )
+
+        return self._batchers[key]
+
+    async def run_model(
+        self,
+        model_name: str,
+        texts: list[str],
+        single: bool,
+        params: DecodingParams,
+    ) -> list[str]:
+        # Одиночные строки от разных запросов собираются в общий батч
+        if single:
+            batcher = self._get_batcher(model_name, params)
+            return list(await asyncio.gather(*[batcher.submit(text) for text in texts]))
+
+        # Большие списки переводятся бакетами строк близкой длины, а серверу
+        # инференса уходят частями, чтобы каждая уложилась в таймаут
+        return await self._translate_in_buckets(model_name, texts, params)
+
+    async def _translate_texts(
+        self,
+        model_name: str,
+        texts: list[str],
+        single: bool,
+        params: DecodingParams,
+    ) -> list[str]:
+        keys = [
+            translation_memory.key(model_name, text, params.signature) for text in texts
+        ]
+        translations = await translation_memory.get_many(keys)
+
+        # Строки, совпавшие после маскирования ("%1 файлов" и "%2 файлов"),
+        # переводятся один раз
+        self.deduplicated += len(keys) - len(set(keys))
+
+        # Модель запускается только для строк, которых нет в памяти переводов
+        missing_by_key: dict[str, int] = {}
+        for index, key in enumerate(keys):
+            if key not in translations:
+                missing_by_key.setdefault(key, index)
+        missing = list(missing_by_key.values())
+
+        if missing:
+            translated = await self.run_model(
+                model_name,
+                [texts[index] for index in missing],
+                single,
+                params,
+            )
+            new_translations = {
+                keys[index]: translation
+                for index, translation in zip(missing, translated)
+            }
+            await translation_memory.set_many(new_translations)
+            translations.update(new_translations)
+
+        return [translations[key] for key in keys]
+
+    def _prepare(self, texts: list[str]) -> list[PreparedText]:
+        prepared = [prepare_text(text) for text in texts]
+
+        for item in prepared:
+            if item.action == PreprocessAction.SKIP:
+                self.skipped += 1
+            elif item.action == PreprocessAction.COPY:
+                self.copied += 1
+            elif item.placeholders:
+                self.masked += 1
+
+        return prepared
+
     async def translate(
         self,
         texts: str | list[str],
         language: str,
-        max_length=512,
-        num_beams=5,
+        profile: DecodingProfile = DecodingProfile.QUALITY,
     ):
         try:
-            # Определение устройства (GPU или CPU)
-            device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-
             model_name = self._resolve_translation_language_in_file(language)
+            params = DECODING_PROFILES[profile]
+            single = isinstance(texts, str)
+            prepared = self._prepare([texts] if single else texts)
 
-            # Загрузка токенизатора и модели
-            tokenizer = MarianTokenizer.from_pretrained(model_name)
-            model = MarianMTModel.from_pretrained(model_name).to(device)
-
-            # Токенизация входных текстов с учётом максимальной длины
-            inputs = tokenizer(
-                texts,
-                return_tensors="pt",
-                padding=True,
-                truncation=True,
-                max_length=max_length,
-            ).to(device)
-
-            # Генерация перевода с использованием beam search
-            translated_tokens = model.generate(
-                **inputs,
-                num_beams=num_beams,
-                early_stopping=True,
-                max_length=max_length,
+            # Пустые строки, числа и плейсхолдеры в модель не попадают
+            to_translate = [
+                item.text
+                for item in prepared
+                if item.action == PreprocessAction.TRANSLATE
+            ]
+            translated = iter(
+                await self._translate_texts(model_name, to_translate, single, params)
+                if to_translate
+                else []
             )
 
-            # Декодирование переведённых токенов в текст
-            translated_texts = tokenizer.batch_decode(
-                translated_tokens, skip_special_tokens=True
-            )
+            return [
+                (
+                    restore_text(next(translated), item)
+                    if item.action == PreprocessAction.TRANSLATE
+                    else item.text
+                )
+                for item in prepared
+            ]
 
-            return translated_texts
+        except HTTPException:
+            raise
 
         except Exception as e:
-            print(f"Ошибка при переводе: {e}")
+            logger.error(f"Ошибка при переводе: {e}")
             return []
 
+    async def translate_deduplicated(
+        self,
+        texts: list[str],
+        language: str,
+        profile: DecodingProfile = DecodingProfile.QUALITY,
+    ) -> tuple[list[str], int]:
+        # Одинаковые строки из разных контекстов переводятся один раз
+        unique_texts = list(dict.fromkeys(texts))
+        deduplicated = len(texts) - len(unique_texts)
+        self.deduplicated += deduplicated
+
+        translated = await self.translate(
+            texts=unique_texts, language=language, profile=profile
+        )
+
+        if len(translated) != len(unique_texts):
+            return [], deduplicated
+
+        translation_by_text = dict(zip(unique_texts, translated))
+        return [translation_by_text[text] for text in texts], deduplicated
+
+    def translate_stream(
+        self,
+        texts: list[str],
+        language: str,
+        profile: DecodingProfile = DecodingProfile.QUALITY,
+    ) -> AsyncIterator[list[tuple[int, str]]]:
+        # Язык проверяется до начала потока, чтобы ошибка ушла кодом ответа
+        try:
+            model_name = self._resolve_translation_language_in_file(language)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e)) from e
+
+        return self._translate_stream(texts, model_name, DECODING_PROFILES[profile])
+
+    async def _translate_stream(
+        self,
+        texts: list[str],
+        model_name: str,
+        params: DecodingParams,
+    ) -> AsyncIterator[list[tuple[int, str]]]:
+        unique_texts = list(dict.fromkeys(texts))
+        prepared_by_text = dict(zip(unique_texts, self._prepare(unique_texts)))
+
+        # Строки группируются по маскированному тексту: "%1 файлов" и "%2 файлов"
+        # переводятся один раз
+        ready: list[tuple[int, str]] = []
+        groups: dict[str, list[tuple[int, PreparedText]]] = {}
+        for position, text in enumerate(texts):
+            item = prepared_by_text[text]
+            if item.action == PreprocessAction.TRANSLATE:
+                groups.setdefault(item.text, []).append((position, item))
+            else:
+                ready.append((position, item.text))
+
+        masked_texts = list(groups)
+        self.deduplicated += len(texts) - len(ready) - len(masked_texts)
+
+        keys = [
+            translation_memory.key(model_name, text, params.signature)
+            for text in masked_texts
+        ]
+        cached = await translation_memory.get_many(keys)
+
+        # Сначала отдаются строки без перевода и из памяти переводов,
+        # затем бакеты по мере готовности
+        ready += [
+            (position, restore_text(cached[key], item))
+            for text, key in zip(masked_texts, keys)
+            if key in cached
+            for position, item in groups[text]
+        ]
+        if ready:
+            yield ready
+
+        missing = [index for index, key in enumerate(keys) if key not in cached]
+        missing_texts = [masked_texts[index] for index in missing]
+
+        async for bucket, translated in self._iter_buckets(
+            model_name, missing_texts, params
+        ):
+            await translation_memory.set_many(
+                {
+                    keys[missing[index]]: translation
+                    for index, translation in zip(bucket, translated)
+                }
+            )
+            yield [
+                (position, restore_text(translation, item))
+                for index, translation in zip(bucket, translated)
+                for position, item in groups[missing_texts[index]]
+            ]
+
+    def validate_languages(self, languages: list[str]) -> None:
+        for language in languages:
+            self._resolve_translation_language_in_file(language)
+
+    def load_models(self, languages: list[str]) -> None:
+        # Модели языков из предзагрузки закрепляются и не выгружаются по простою
+        if self._remote:
+            return
+
+        for language in languages:
+            model_name = self._resolve_translation_language_in_file(language)
+            model_registry.get(model_name)
+            model_registry.pin(model_name)
+
+    async def warm_up(self, languages: list[str]) -> None:
+        # Модели загружаются и прогоняются заранее, до того как придёт трафик
+        await inference_executor.run(self.load_models, languages)
+
+        for language in languages:
+            model_name = self._resolve_translation_language_in_file(language)
+            logger.info(f"Warm up translation model {model_name}")
+            await self.run_model(
+                model_name,
+                [project_settings.TRANSLATION_WARMUP_TEXT],
+                False,
+                DECODING_PROFILES[DecodingProfile.FAST],
+            )
+
+        self.ready = True
+        logger.info("Translation service is ready")
+
+    def batching_stats(self) -> MicroBatcherStats:
+        batchers = [batcher.stats() for batcher in self._batchers.values()]
+        return MicroBatcherStats(
+            batches=sum(stats.batches for stats in batchers),
+            items=sum(stats.items for stats in batchers),
+            pending=sum(stats.pending for stats in batchers),
+        )
+
+    def preprocessing_stats(self) -> PreprocessingStats:
+        return PreprocessingStats(
+            skipped=self.skipped, copied=self.copied, masked=self.masked
+        )
+
     @staticmethod
     def register():
-        return TranslationService()
+        return translation_service
 
     @staticmethod
     def register_deps():
         return Annotated[TranslationService, Depends(get_translation_service)]
 
 
+translation_service = TranslationService(
+    remote=remote_inference if remote_inference.enabled else None
+)
+
+
 async def get_translation_service():
-    return TranslationService()
+    return translation_service
@@ -0,0 +1,273 @@
+import argparse
+import asyncio
+import io
+import json
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+sys.path = ["", ".."] + sys.path[1:]
+
+import sentencepiece
+import torch
+from transformers import MarianConfig, MarianMTModel, MarianTokenizer
+
+from app.config.settings import project_settings
+from app.enums.language import LanguageEnums
+from app.services.translation.decoding import DecodingParams
+from app.services.translation.inference_executor import inference_executor
+from app.services.translation.model_registry import model_registry
+from app.services.translation.translation_service import translation_service
+
+WORDS = """
+открыть сохранить файл настройки программы отмена выход справка удалить
+выбранные элементы показать скрытые папка ошибка подключения сервер
+обновление версия окно панель инструменты вставить копировать вырезать найти
+заменить проект перевод строка язык готово применить закрыть
+""".split()
+
+
+def make_sentences(count: int, seed: int) -> list[str]:
+    rng = random.Random(seed)
+    return [
+        " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 12))).capitalize()
+        for _ in range(count)
+    ]
+
+
+def build_tiny_model(workdir: Path) -> tuple[MarianTokenizer, MarianMTModel]:
+    # Случайно инициализированная маленькая Marian-модель: бенчмарк не ходит в сеть
+    proto = io.BytesIO()
+    sentencepiece.SentencePieceTrainer.train(
+        sentence_iterator=iter(make_sentences(2000, seed=0)),
+        model_writer=proto,
+        vocab_size=128,
+        character_coverage=1.0,
+        hard_vocab_limit=False,
+    )
+    processor = sentencepiece.SentencePieceProcessor(model_proto=proto.getvalue())
+
+    for name in ("source.spm", "target.spm"):
+        (workdir / name).write_bytes(proto.getvalue())
+
+    vocab = {
+        processor.id_to_piece(index): index
+        for index in range(processor.get_piece_size())
+    }
+    vocab["<pad>"] = len(vocab)
+    (workdir / "vocab.json").write_text(json.dumps(vocab), encoding="utf-8")
+
+    tokenizer = MarianTokenizer(
+        source_spm=str(workdir / "source.spm"),
+        target_spm=str(workdir / "target.spm"),
+        vocab=str(workdir / "vocab.json"),
+    )
+
+    torch.manual_seed(0)
+    config = MarianConfig(
+        vocab_size=len(vocab),
+        d_model=64,
+        encoder_layers=2,
+        decoder_layers=2,
+        encoder_attention_heads=4,
+        decoder_attention_heads=4,
+        encoder_ffn_dim=128,
+        decoder_ffn_dim=128,
+        max_position_embeddings=512,
+        pad_token_id=tokenizer.pad_token_id,
+        eos_token_id=tokenizer.eos_token_id,
+        decoder_start_token_id=tokenizer.pad_token_id,
+    )
+    return tokenizer, MarianMTModel(config).eval()
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    index = min(int(round(q / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+def read_status_mb(field: str) -> float | None:
+    try:
+        with open("/proc/self/status", encoding="utf-8") as f:
+            for line in f:
+                if line.startswith(f"{field}:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        return None
+    return None
+
+
+def reset_peak_rss() -> float | None:
+    # ru_maxrss - пик за всю жизнь процесса, поэтому перед каждым сценарием
+    # VmHWM сбрасывается до текущего RSS (только Linux)
+    try:
+        with open("/proc/self/clear_refs", "w", encoding="utf-8") as f:
+            f.write("5")
+    except OSError:
+        return None
+    return read_status_mb("VmRSS")
+
+
+def count_tokens(model_name: str, texts: list[str]) -> int:
+    tokenizer = model_registry.get(model_name).tokenizer
+    return sum(len(ids) for ids in tokenizer(texts)["input_ids"])
+
+
+def summarize(
+    scenario: dict,
+    latencies: list[float],
+    sentences: int,
+    tokens: int,
+    elapsed: float,
+    rss_before_mb: float | None,
+) -> dict:
+    peak_rss_mb = read_status_mb("VmHWM") if rss_before_mb is not None else None
+    return {
+        **scenario,
+        "sentences_per_second": round(sentences / elapsed, 2),
+        "tokens_per_second": round(tokens / elapsed, 2),
+        "latency_p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "latency_p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "latency_p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "peak_rss_mb": round(peak_rss_mb, 1) if peak_rss_mb else None,
+        "peak_rss_delta_mb": (
+            round(peak_rss_mb - rss_before_mb, 1) if peak_rss_mb else None
+        ),
+    }
+
+
+async def bench_batches(
+    model_name: str, batch_size: int, num_beams: int, rounds: int
+) -> dict:
+    params = DecodingParams(
+        num_beams=num_beams,
+        max_length=project_settings.TRANSLATION_MAX_LENGTH,
+        length_ratio=project_settings.TRANSLATION_LENGTH_RATIO,
+        length_margin=project_settings.TRANSLATION_LENGTH_MARGIN,
+    )
+    latencies = []
+    # Батчи и число токенов готовятся заранее, чтобы не попасть в замер
+    batches = [make_sentences(batch_size, seed=index + 1) for index in range(rounds)]
+    tokens = sum(count_tokens(model_name, texts) for texts in batches)
+
+    rss_before_mb = reset_peak_rss()
+    started = time.perf_counter()
+    for texts in batches:
+        call_started = time.perf_counter()
+        await inference_executor.run(
+            translation_service._generate, model_name, texts, params
+        )
+        latencies.append(time.perf_counter() - call_started)
+    elapsed = time.perf_counter() - started
+
+    return summarize(
+        {"scenario": "batch", "batch_size": batch_size, "num_beams": num_beams},
+        latencies,
+        batch_size * rounds,
+        tokens,
+        elapsed,
+        rss_before_mb,
+    )
+
+
+async def bench_concurrency(
+    model_name: str, concurrency: int, num_beams: int, requests: int
+) -> dict:
+    params = DecodingParams(
+        num_beams=num_beams,
+        max_length=project_settings.TRANSLATION_MAX_LENGTH,
+        length_ratio=project_settings.TRANSLATION_LENGTH_RATIO,
+        length_margin=project_settings.TRANSLATION_LENGTH_MARGIN,
+    )
+    texts = make_sentences(requests, seed=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies = []
+
+    # Одиночные запросы идут через микробатчер в обход памяти переводов
+    async def one(text: str) -> None:
+        async with semaphore:
+            call_started = time.perf_counter()
+            await translation_service.run_model(model_name, [text], True, params)
+            latencies.append(time.perf_counter() - call_started)
+
+    rss_before_mb = reset_peak_rss()
+    started = time.perf_counter()
+    await asyncio.gather(*[one(text) for text in texts])
+    elapsed = time.perf_counter() - started
+
+    return summarize(
+        {"scenario": "concurrency", "concurrency": concurrency, "num_beams": num_beams},
+        latencies,
+        requests,
+        count_tokens(model_name, texts),
+        elapsed,
+        rss_before_mb,
+    )
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Translation throughput benchmark")
+    parser.add_argument(
+        "--real-model",
+        action="store_true",
+        help="use Helsinki-NLP weights instead of a tiny random model",
+    )
+    parser.add_argument("--language", default=LanguageEnums.EN.name)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--beams", type=int, nargs="+", default=[1, 2, 5])
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--output", default="translation_benchmark.json")
+    args = parser.parse_args()
+
+    model_name = LanguageEnums[args.language.upper()].value
+
+    with tempfile.TemporaryDirectory() as workdir:
+        if not args.real_model:
+            tokenizer, model = build_tiny_model(Path(workdir))
+            model_registry.put(model_name, tokenizer, model)
+
+        # Прогрев, чтобы первый замер не включал загрузку и инициализацию
+        await bench_batches(model_name, batch_size=1, num_beams=1, rounds=1)
+
+        results = []
+        for batch_size in args.batch_sizes:
+            for num_beams in args.beams:
+                results.append(
+                    await bench_batches(model_name, batch_size, num_beams, args.rounds)
+                )
+                print(results[-1])
+
+        for concurrency in args.concurrency:
+            for num_beams in args.beams:
+                results.append(
+                    await bench_concurrency(
+                        model_name, concurrency, num_beams, args.requests
+                    )
+                )
+                print(results[-1])
+
+    report = {
+        "created": datetime.now(timezone.utc).isoformat(),
+        "model": model_name if args.real_model else "tiny-random-marian",
+        "backend": project_settings.TRANSLATION_BACKEND.value,
+        "torch": torch.__version__,
+        "torch_threads": torch.get_num_threads(),
+        "inference_workers": project_settings.TRANSLATION_INFERENCE_WORKERS,
+        "batch_window_ms": project_settings.TRANSLATION_BATCH_WINDOW_MS,
+        "results": results,
+    }
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+
+    inference_executor.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
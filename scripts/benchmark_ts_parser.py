@@ -0,0 +1,131 @@
+import argparse
+import asyncio
+import json
+import random
+import resource
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+sys.path = ["", ".."] + sys.path[1:]
+
+from bs4 import BeautifulSoup
+
+from app.parsing.ts.ts import ts_format_parser
+
+WORDS = ["Открыть", "файл", "сохранить", "настройки", "программы", "отмена", "выход"]
+
+
+def make_ts(contexts: int, messages: int, seed: int = 0) -> bytes:
+    rng = random.Random(seed)
+    parts = [
+        '<?xml version="1.0" encoding="utf-8"?>\n<!DOCTYPE TS>\n'
+        '<TS version="2.1" language="en_US" sourcelanguage="ru_RU">\n'
+    ]
+    for context in range(contexts):
+        parts.append(f"<context>\n    <name>Context{context}</name>\n")
+        for message in range(messages):
+            text = " ".join(rng.choice(WORDS) for _ in range(rng.randint(1, 8)))
+            parts.append(
+                "    <message>\n"
+                f'        <location filename="../src/file{context}.cpp" '
+                f'line="{message + 1}"/>\n'
+                f"        <source>{text} &amp; %1</source>\n"
+                "        <!-- comment -->\n"
+                f'        <translation type="unfinished">{text}</translation>\n'
+                "    </message>\n"
+            )
+        parts.append("</context>\n")
+    parts.append("</TS>\n")
+    return "".join(parts).encode("utf-8")
+
+
+def from_ts_to_json_bs4(file_content: bytes) -> dict:
+    # Прежняя реализация на BeautifulSoup, эталон для сравнения результата
+    soup = BeautifulSoup(file_content, "xml")
+    ts = soup.find("TS")
+    final_dict = []
+    for context in soup.find_all("context"):
+        messages = []
+        for message in context.find_all("message"):
+            location = message.find("location")
+            messages.append(
+                {
+                    "source": message.find("source").get_text(strip=True),
+                    "translation": message.find("translation").get_text(strip=True),
+                    "filename": location["filename"],
+                    "line": location["line"],
+                }
+            )
+        final_dict.append({context.find("name").get_text(strip=True): messages})
+    return {
+        "language": ts["language"],
+        "sourcelanguage": ts["sourcelanguage"],
+        "contexts": final_dict,
+    }
+
+
+def measure(func) -> tuple[float, int]:
+    started = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - started
+
+    # Пик считается отдельным прогоном: tracemalloc сильно замедляет разбор.
+    # Аллокации libxml2 в него не попадают, только Python-объекты
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+
+def count_streaming(content: bytes) -> int:
+    return sum(1 for _ in ts_format_parser.iter_ts(BytesIO(content)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare TS parsers")
+    parser.add_argument("--contexts", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--messages", type=int, default=100)
+    parser.add_argument("--output", default="ts_parser_benchmark.json")
+    args = parser.parse_args()
+
+    results = []
+    for contexts in args.contexts:
+        content = make_ts(contexts, args.messages)
+
+        expected = from_ts_to_json_bs4(content)
+        actual = asyncio.run(ts_format_parser.from_ts_to_json(content))
+
+        bs4_seconds, bs4_peak = measure(lambda: from_ts_to_json_bs4(content))
+        lxml_seconds, lxml_peak = measure(lambda: count_streaming(content))
+
+        results.append(
+            {
+                "messages": contexts * args.messages,
+                "file_bytes": len(content),
+                "identical": actual == expected,
+                "bs4_seconds": round(bs4_seconds, 3),
+                "bs4_python_peak_bytes": bs4_peak,
+                "lxml_seconds": round(lxml_seconds, 3),
+                "lxml_python_peak_bytes": lxml_peak,
+            }
+        )
+        print(results[-1])
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(
+            {
+                "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                / 1024,
+                "results": results,
+            },
+            f,
+            indent=2,
+        )
+
+
+if __name__ == "__main__":
+    main()
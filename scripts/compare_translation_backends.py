@@ -0,0 +1,127 @@
+import argparse
+import json
+import sys
+import time
+
+sys.path = ["", ".."] + sys.path[1:]
+
+from transformers import MarianTokenizer
+
+from app.enums.language import LanguageEnums
+from app.enums.translation import InferenceBackendType
+from app.services.translation.backends import get_backend
+
+SAMPLES = [
+    "Открыть файл",
+    "Сохранить как...",
+    "Отмена",
+    "Настройки программы",
+    "Не удалось подключиться к серверу",
+    "Вы действительно хотите удалить выбранные элементы?",
+    "Показать скрытые файлы",
+    "Справка",
+    "Выход из программы без сохранения изменений",
+    "Проверить наличие обновлений",
+]
+
+
+def translate(model, tokenizer, device, texts: list[str], num_beams: int) -> list[str]:
+    inputs = tokenizer(texts, return_tensors="pt", padding=True, truncation=True).to(
+        device
+    )
+    tokens = model.generate(**inputs, num_beams=num_beams, max_length=512)
+    return tokenizer.batch_decode(tokens, skip_special_tokens=True)
+
+
+def run_backend(
+    backend_type: InferenceBackendType,
+    model_name: str,
+    texts: list[str],
+    num_beams: int,
+    repeats: int,
+) -> dict:
+    backend = get_backend(backend_type)
+    tokenizer = MarianTokenizer.from_pretrained(model_name)
+
+    started = time.perf_counter()
+    model = backend.load_model(model_name)
+    load_seconds = time.perf_counter() - started
+
+    # Первый прогон не учитывается: в нём инициализируются ядра и кэши
+    translations = translate(model, tokenizer, backend.device(), texts, num_beams)
+
+    started = time.perf_counter()
+    for _ in range(repeats):
+        translate(model, tokenizer, backend.device(), texts, num_beams)
+    elapsed = time.perf_counter() - started
+
+    return {
+        "backend": backend_type.value,
+        "load_seconds": round(load_seconds, 3),
+        "model_bytes": backend.model_size(model),
+        "sentences_per_second": round(len(texts) * repeats / elapsed, 2),
+        "translations": translations,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare translation backends for parity and throughput"
+    )
+    parser.add_argument("--language", default=LanguageEnums.EN.name)
+    parser.add_argument("--num-beams", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument(
+        "--backends",
+        nargs="+",
+        default=[backend.value for backend in InferenceBackendType],
+    )
+    parser.add_argument("--output", default="backend_comparison.json")
+    args = parser.parse_args()
+
+    model_name = LanguageEnums[args.language.upper()].value
+    results = []
+
+    for backend in args.backends:
+        try:
+            results.append(
+                run_backend(
+                    InferenceBackendType(backend),
+                    model_name,
+                    SAMPLES,
+                    args.num_beams,
+                    args.repeats,
+                )
+            )
+        except RuntimeError as e:
+            print(f"{backend}: skipped ({e})")
+
+    # Эталоном считается обычный torch, остальные сравниваются с ним построчно
+    reference = next(
+        (r for r in results if r["backend"] == InferenceBackendType.TORCH), None
+    )
+
+    for result in results:
+        if reference:
+            matches = sum(
+                a == b
+                for a, b in zip(result["translations"], reference["translations"])
+            )
+            result["parity"] = round(matches / len(SAMPLES), 3)
+
+        print(
+            f"{result['backend']}: {result['sentences_per_second']} sentences/s, "
+            f"parity {result.get('parity')}, {result['model_bytes']} bytes"
+        )
+
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(
+            {"model": model_name, "samples": SAMPLES, "results": results},
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+if __name__ == "__main__":
+    main()
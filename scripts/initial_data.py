@@ -1,17 +1,15 @@
 import asyncio
 import sys
 
-from app.config.db.postgres.session import async_session
-
 sys.path = ["", ".."] + sys.path[1:]
 
 from app.config.db.init import init_db
+from app.config.db.postgres.session import postgres_session
 
 
 async def init_psql() -> None:
-    db = async_session
-    await init_db(db)
-    await db.close()
+    async with postgres_session() as db:
+        await init_db(db)
 
 
 async def main() -> None:
@@ -0,0 +1,26 @@
+import argparse
+import asyncio
+import sys
+
+sys.path = ["", ".."] + sys.path[1:]
+
+from app.config.settings import project_settings
+from app.services.translation.inference_server import InferenceServer
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description="Translation inference server")
+    parser.add_argument(
+        "--socket",
+        default=next(
+            iter(project_settings.TRANSLATION_SERVER_SOCKETS),
+            "/tmp/translation.sock",
+        ),
+    )
+    args = parser.parse_args()
+
+    await InferenceServer(path=args.socket).serve_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
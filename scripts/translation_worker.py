@@ -0,0 +1,14 @@
+import asyncio
+import sys
+
+sys.path = ["", ".."] + sys.path[1:]
+
+from app.services.translation.job_worker import translation_job_worker
+
+
+async def main() -> None:
+    await translation_job_worker.run_forever()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())